@@ -1,20 +1,100 @@
 import datetime
+import functools
+import json
 import logging
 import re
-import pytz
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.errors import HttpError
 
 from .models import CalendarToken, CalendarEventSnapshot
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent Google API requests issued for a single phone.
+_MAX_FETCH_WORKERS = 8
+
+# How long a token's discovered Birthdays calendar id is reused before
+# calendarList is queried again.
+BIRTHDAY_CAL_ID_CACHE_TIMEOUT = 60 * 60 * 24
+
+# How long a sync's view of upcoming events serves block-command conflict checks.
+UPCOMING_EVENTS_CACHE_TIMEOUT = 60 * 5
+
+# How long a queued background refresh suppresses queueing another for the same token.
+REFRESH_QUEUED_CACHE_TIMEOUT = 60
+
+# How long get_user_tz trusts a cached timezone name for a phone.
+USER_TZ_CACHE_TIMEOUT = 60 * 10
+
+# Access tokens this close to expiry get a background refresh queued, so a
+# request rarely has to refresh one inline.
+TOKEN_REFRESH_MARGIN = datetime.timedelta(minutes=5)
+
+# CalendarToken columns needed to build a client and fetch events for it.
+_API_TOKEN_FIELDS = (
+    'phone_number', 'account_email', 'access_token', 'refresh_token',
+    'token_expiry', 'timezone',
+)
+
+# Per-process memo of built API clients: token.pk -> (deadline, access_token,
+# service). An entry is reused until its access token is due for refresh;
+# beyond _SERVICE_CACHE_MAX_ENTRIES the least recently used entry is dropped.
+_SERVICE_CACHE = OrderedDict()
+_SERVICE_CACHE_LOCK = threading.Lock()
+_SERVICE_CACHE_DEFAULT_TTL = 60 * 5
+_SERVICE_CACHE_MAX_ENTRIES = 500
+
+# Partial-response masks for events.list: only the event fields each caller
+# reads. All-day events are still filtered client-side (they lack dateTime).
+_DAY_EVENT_FIELDS = 'items(summary,eventType,start,end)'
+_BIRTHDAY_EVENT_FIELDS = 'items(id,summary,start)'
+_SYNC_EVENT_FIELDS = 'items(id,summary,start/dateTime,end/dateTime)'
+_CONFLICT_EVENT_FIELDS = 'items(summary,start/dateTime)'
+_SYNC_DELTA_FIELDS = 'items(id,status,recurrence,start/dateTime),nextPageToken,nextSyncToken'
+# calendarList entries are only searched for the Birthdays calendar.
+_CALENDAR_LIST_FIELDS = 'items(id,summary)'
+
+# Page size for the incremental-sync feed (the API maximum).
+_SYNC_FEED_PAGE_SIZE = 2500
+
+# Last second of a local day, used for inclusive day-range queries.
+_END_OF_DAY = datetime.time(23, 59, 59)
+
+# Rows per INSERT/UPDATE statement when writing snapshot changes.
+_SNAPSHOT_BATCH_SIZE = 500
+
+# /block command parsing
+_DAY_NAMES = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+_DAY_INDEX = {name: i for i, name in enumerate(_DAY_NAMES)}
+_TIME_RANGE_RE = re.compile(
+    r'^(\d{1,2}(?::\d{2})?(?:am|pm)?)-(\d{1,2}(?::\d{2})?(?:am|pm)?)$', re.IGNORECASE
+)
+_SINGLE_TIME_RE = re.compile(r'^(\d{1,2})(?::(\d{2}))?(am|pm)?$')
+# <prefix> <date> <time range> [title]; date may be "next <day>"
+_BLOCK_CMD_RE = re.compile(
+    r'^\s*(?:add meeting|block)\s+((?:next )?\S+)\s+(\S+)(?:\s+(.+?))?\s*$', re.IGNORECASE
+)
+
 
 def get_calendar_service(token):
     """
     Accept a CalendarToken object, build credentials, refresh if expired,
-    and return a Google Calendar API service client.
+    and return a Google Calendar API service client. A token that is still
+    usable but close to expiry is refreshed by a background task instead.
     """
     logger.info(
         'get_calendar_service called: phone=%s email=%s',
@@ -22,68 +102,325 @@ def get_calendar_service(token):
         token.account_email,
     )
 
-    creds = Credentials(
+    with _SERVICE_CACHE_LOCK:
+        cached = _SERVICE_CACHE.get(token.pk)
+        if cached is not None:
+            _SERVICE_CACHE.move_to_end(token.pk)
+    if cached is not None:
+        deadline, access_token, service = cached
+        if access_token == token.access_token and time.monotonic() < deadline:
+            return service
+
+    creds = _build_credentials(token)
+    if not creds.valid and token.refresh_token:
+        creds = refresh_access_token(token)
+    elif not creds.valid:
+        logger.warning(
+            'Token invalid but cannot refresh for phone=%s email=%s '
+            '(expired=%s has_refresh_token=%s)',
+            token.phone_number,
+            token.account_email,
+            creds.expired,
+            bool(creds.refresh_token),
+        )
+    elif _token_needs_refresh(token):
+        _enqueue_token_refresh(token)
+
+    service = build_from_document(_calendar_discovery_doc(), credentials=creds)
+
+    if creds.expiry:
+        ttl = (
+            creds.expiry - datetime.datetime.utcnow()
+        ).total_seconds() - TOKEN_REFRESH_MARGIN.total_seconds()
+    else:
+        ttl = _SERVICE_CACHE_DEFAULT_TTL
+    if creds.valid and ttl > 0 and token.pk is not None:
+        with _SERVICE_CACHE_LOCK:
+            _SERVICE_CACHE[token.pk] = (time.monotonic() + ttl, token.access_token, service)
+            _SERVICE_CACHE.move_to_end(token.pk)
+            while len(_SERVICE_CACHE) > _SERVICE_CACHE_MAX_ENTRIES:
+                _SERVICE_CACHE.popitem(last=False)
+    return service
+
+
+@functools.lru_cache(maxsize=None)
+def _calendar_discovery_doc():
+    """
+    The bundled Calendar v3 discovery document, read and parsed once per
+    process. build() would re-read and re-parse the ~115 KB file on every
+    call. googleapiclient fills in some defaults on the dict the first time
+    a client is built from it; those updates are idempotent, so the one
+    dict can be shared.
+    """
+    return json.loads(get_static_doc('calendar', 'v3'))
+
+
+def _build_credentials(token):
+    # google-auth compares expiry against naive UTC
+    expiry = None
+    if token.token_expiry:
+        expiry = token.token_expiry.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+    return Credentials(
         token=token.access_token,
         refresh_token=token.refresh_token,
         token_uri='https://oauth2.googleapis.com/token',
-        client_id=_get_client_id(),
-        client_secret=_get_client_secret(),
+        client_id=settings.GOOGLE_CLIENT_ID,
+        client_secret=settings.GOOGLE_CLIENT_SECRET,
+        expiry=expiry,
     )
 
-    # Refresh if token is not valid (handles token_expiry=None safely)
-    if not creds.valid:
-        if creds.expired and creds.refresh_token:
-            logger.info(
-                'Refreshing expired access token for phone=%s email=%s',
-                token.phone_number,
-                token.account_email,
-            )
+
+def _token_must_refresh_inline(token):
+    """
+    True when the access token can no longer be used as-is (missing,
+    expired, or inside google-auth's own refresh threshold) and a refresh
+    token is available.
+    """
+    return bool(token.refresh_token) and not _build_credentials(token).valid
+
+
+def _enqueue_token_refresh(token):
+    """Queue one background refresh per token while its access token is still usable."""
+    from .tasks import refresh_calendar_token
+
+    if not cache.add(_refresh_queued_cache_key(token.pk), True, REFRESH_QUEUED_CACHE_TIMEOUT):
+        return
+    try:
+        refresh_calendar_token.delay(token.pk)
+    except Exception:
+        cache.delete(_refresh_queued_cache_key(token.pk))
+        logger.exception(
+            'Could not queue token refresh for phone=%s email=%s',
+            token.phone_number,
+            token.account_email,
+        )
+
+
+def _refresh_queued_cache_key(token_pk):
+    return f'calendar_bot:refresh_queued:{token_pk}'
+
+
+def _token_needs_refresh(token, now=None):
+    """
+    True when the access token expires within TOKEN_REFRESH_MARGIN (or its
+    expiry is unknown) and a refresh token is available.
+    """
+    if not token.refresh_token:
+        return False
+    if token.token_expiry is None:
+        return True
+    now = now or datetime.datetime.now(tz=datetime.timezone.utc)
+    return token.token_expiry - now < TOKEN_REFRESH_MARGIN
+
+
+def _refresh_credentials(token):
+    """
+    Exchange token's refresh token for a new access token and return the
+    refreshed Credentials. Does not touch the database.
+    """
+    creds = _build_credentials(token)
+    logger.info(
+        'Refreshing access token for phone=%s email=%s',
+        token.phone_number,
+        token.account_email,
+    )
+    try:
+        creds.refresh(Request())
+    except Exception:
+        logger.exception(
+            'Failed to refresh access token for phone=%s email=%s',
+            token.phone_number,
+            token.account_email,
+        )
+        raise
+    return creds
+
+
+def _apply_refreshed_credentials(token, creds):
+    token.access_token = creds.token
+    if creds.expiry:
+        token.token_expiry = creds.expiry.replace(tzinfo=datetime.timezone.utc)
+
+
+def refresh_access_token(token):
+    """
+    Exchange token's refresh token for a new access token, save only the new
+    access token and expiry on the row, and return the refreshed Credentials.
+    """
+    creds = _refresh_credentials(token)
+    _apply_refreshed_credentials(token, creds)
+    token.save(update_fields=['access_token', 'token_expiry', 'updated_at'])
+    logger.info(
+        'Access token refreshed and saved for phone=%s email=%s',
+        token.phone_number,
+        token.account_email,
+    )
+    return creds
+
+
+def refresh_tokens(tokens):
+    """
+    Refresh several tokens' access tokens concurrently and save them with a
+    single bulk update. Failures are logged and skipped. Returns the list
+    of tokens that were refreshed.
+    """
+    results = _map_concurrently(_refresh_credentials, tokens)
+    refreshed = []
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    for token, creds in zip(tokens, results):
+        if isinstance(creds, Exception):
+            continue
+        _apply_refreshed_credentials(token, creds)
+        token.updated_at = now
+        refreshed.append(token)
+    if refreshed:
+        CalendarToken.objects.bulk_update(
+            refreshed, ['access_token', 'token_expiry', 'updated_at'],
+        )
+    logger.info('refresh_tokens: refreshed=%d of %d', len(refreshed), len(tokens))
+    return refreshed
+
+
+def _refresh_due_tokens(tokens):
+    """Refresh, in one concurrent wave, the tokens get_calendar_service would refresh inline."""
+    due = [token for token in tokens if _token_must_refresh_inline(token)]
+    if due:
+        refresh_tokens(due)
+
+
+def forget_calendar_service(token_pk):
+    """Drop the memoized API client for a token (e.g. after it is deleted)."""
+    with _SERVICE_CACHE_LOCK:
+        _SERVICE_CACHE.pop(token_pk, None)
+
+
+def _map_concurrently(func, items):
+    """
+    Call func(item) for every item on a small thread pool and return the
+    results in input order. A call that raises yields its exception in place
+    of a result, so one failing account never hides the others.
+
+    Only I/O belongs in func: build services (which may refresh and save a
+    token) on the calling thread first.
+    """
+    if len(items) <= 1:
+        results = []
+        for item in items:
             try:
-                creds.refresh(Request())
-            except Exception:
-                logger.exception(
-                    'Failed to refresh access token for phone=%s email=%s',
-                    token.phone_number,
-                    token.account_email,
-                )
-                raise
-            token.access_token = creds.token
-            if creds.expiry:
-                token.token_expiry = creds.expiry.replace(tzinfo=pytz.UTC)
-            token.save()
-            logger.info(
-                'Access token refreshed and saved for phone=%s email=%s',
-                token.phone_number,
-                token.account_email,
-            )
-        else:
-            logger.warning(
-                'Token invalid but cannot refresh for phone=%s email=%s '
-                '(expired=%s has_refresh_token=%s)',
-                token.phone_number,
-                token.account_email,
-                creds.expired,
-                bool(creds.refresh_token),
-            )
+                results.append(func(item))
+            except Exception as exc:
+                results.append(exc)
+        return results
 
-    return build('calendar', 'v3', credentials=creds)
+    with ThreadPoolExecutor(max_workers=min(_MAX_FETCH_WORKERS, len(items))) as pool:
+        futures = [pool.submit(func, item) for item in items]
+    return [f.exception() or f.result() for f in futures]
+
+
+def _user_tz_cache_key(phone_number):
+    return f'calendar_bot:user_tz:{phone_number}'
+
+
+def invalidate_user_tz(phone_number):
+    """Drop the cached timezone for a phone after its tokens change."""
+    cache.delete(_user_tz_cache_key(phone_number))
 
 
 def get_user_tz(phone_number):
     """
-    Return the pytz timezone object for the user. Uses the first token
+    Return the ZoneInfo timezone for the user. Uses the first token
     (ordered by created_at). Defaults to UTC if no token exists or the
     stored timezone is invalid.
+
+    The timezone name is cached per phone for USER_TZ_CACHE_TIMEOUT seconds;
+    CalendarToken save/delete signals invalidate it.
     """
+    cache_key = _user_tz_cache_key(phone_number)
     try:
-        token = CalendarToken.objects.filter(
-            phone_number=phone_number
-        ).order_by('created_at').first()
-        if token is None:
-            return pytz.UTC
-        return pytz.timezone(token.timezone)
+        tz_name = cache.get(cache_key)
+        if tz_name is None:
+            token = CalendarToken.objects.filter(
+                phone_number=phone_number
+            ).order_by('created_at').only('timezone').first()
+            tz_name = token.timezone if token is not None else 'UTC'
+            cache.set(cache_key, tz_name, USER_TZ_CACHE_TIMEOUT)
+        return _tz_from_name(tz_name)
     except Exception:
-        return pytz.UTC
+        return datetime.timezone.utc
+
+
+@functools.lru_cache(maxsize=600)
+def _tz_from_name(tz_name):
+    """
+    ZoneInfo for a stored name, or UTC if the name is unknown. Memoized
+    so an invalid stored name does not pay for a failed lookup every call.
+    'UTC' maps to datetime.timezone.utc, the same object every other
+    fallback returns.
+    """
+    if tz_name == 'UTC':
+        return datetime.timezone.utc
+    try:
+        return ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return datetime.timezone.utc
+
+
+def _parse_event_datetime(value):
+    """
+    Parse a Google Calendar dateTime string into an aware datetime.
+    Values without an offset are taken as UTC.
+    """
+    dt = datetime.datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=datetime.timezone.utc)
+    return dt
+
+
+def _local_day_bounds(user_tz, first_day, last_day=None):
+    """
+    Return aware (00:00:00 on first_day, 23:59:59 on last_day) in user_tz;
+    last_day defaults to first_day. ZoneInfo resolves the offset of each
+    wall time itself, so both ends are correct on DST change days.
+    """
+    last_day = last_day or first_day
+    return (
+        datetime.datetime.combine(first_day, datetime.time.min, tzinfo=user_tz),
+        datetime.datetime.combine(last_day, _END_OF_DAY, tzinfo=user_tz),
+    )
+
+
+def _get_tokens_and_tz(phone_number):
+    """
+    Return (tokens, user_tz) for a phone with a single query. The timezone
+    follows get_user_tz: the first token's (by created_at), else UTC.
+    Only the columns needed to call Google are loaded.
+    """
+    tokens = list(
+        CalendarToken.objects.filter(phone_number=phone_number)
+        .order_by('created_at')
+        .only(*_API_TOKEN_FIELDS)
+    )
+    if not tokens:
+        return tokens, datetime.timezone.utc
+    return tokens, _tz_from_name(tokens[0].timezone)
+
+
+def _get_primary_token_and_tz(phone_number):
+    """
+    Return (token, user_tz) for a phone's first token (by created_at) with a
+    single query, or (None, UTC) if it has none. The timezone follows
+    get_user_tz. Only the columns needed to call Google are loaded.
+    """
+    token = (
+        CalendarToken.objects.filter(phone_number=phone_number)
+        .order_by('created_at')
+        .only(*_API_TOKEN_FIELDS)
+        .first()
+    )
+    if token is None:
+        return None, datetime.timezone.utc
+    return token, _tz_from_name(token.timezone)
 
 
 def get_events_for_date(phone_number, target_date, exclude_birthdays=False):
@@ -92,7 +429,8 @@ def get_events_for_date(phone_number, target_date, exclude_birthdays=False):
     date (datetime.date) in the user's local timezone.
     All-day events (birthdays, holidays, etc.) are always skipped.
     Loops all tokens for the phone, merges events, sorts by start time.
-    Returns a list of event dicts with 'start', 'summary', 'end' keys.
+    Returns a list of event dicts with 'start', 'start_str', 'summary' and
+    'end' keys.
     """
     logger.info(
         'get_events_for_date called: phone=%s date=%s',
@@ -100,25 +438,22 @@ def get_events_for_date(phone_number, target_date, exclude_birthdays=False):
         target_date,
     )
 
-    user_tz = get_user_tz(phone_number)
-    tokens = list(CalendarToken.objects.filter(phone_number=phone_number).order_by('created_at'))
+    tokens, user_tz = _get_tokens_and_tz(phone_number)
 
     if not tokens:
         logger.warning('get_events_for_date: no tokens for phone=%s', phone_number)
         return []
 
     # Build timezone-aware start/end for the day
-    day_start = user_tz.localize(
-        datetime.datetime(target_date.year, target_date.month, target_date.day, 0, 0, 0)
-    )
-    day_end = user_tz.localize(
-        datetime.datetime(target_date.year, target_date.month, target_date.day, 23, 59, 59)
-    )
+    day_start, day_end = _local_day_bounds(user_tz, target_date)
 
-    all_events = []
+    # Refresh stale tokens together, build services serially, then fetch
+    # every account's events concurrently.
+    _refresh_due_tokens(tokens)
+    token_services = []
     for token in tokens:
         try:
-            service = get_calendar_service(token)
+            token_services.append((token, get_calendar_service(token)))
         except Exception:
             logger.exception(
                 'Failed to get calendar service in get_events_for_date: phone=%s email=%s date=%s',
@@ -128,20 +463,28 @@ def get_events_for_date(phone_number, target_date, exclude_birthdays=False):
             )
             continue  # skip this token, try others
 
-        try:
-            events_result = service.events().list(
-                calendarId='primary',
-                timeMin=day_start.isoformat(),
-                timeMax=day_end.isoformat(),
-                singleEvents=True,
-                orderBy='startTime',
-            ).execute()
-        except Exception:
-            logger.exception(
+    def _list_day_events(token_service):
+        _, service = token_service
+        return service.events().list(
+            calendarId='primary',
+            timeMin=day_start.isoformat(),
+            timeMax=day_end.isoformat(),
+            singleEvents=True,
+            orderBy='startTime',
+            fields=_DAY_EVENT_FIELDS,
+        ).execute()
+
+    results = _map_concurrently(_list_day_events, token_services)
+
+    all_events = []
+    for (token, _), events_result in zip(token_services, results):
+        if isinstance(events_result, Exception):
+            logger.error(
                 'Google Calendar API error in get_events_for_date: phone=%s email=%s date=%s',
                 phone_number,
                 token.account_email,
                 target_date,
+                exc_info=events_result,
             )
             continue  # skip this token, try others
 
@@ -157,16 +500,12 @@ def get_events_for_date(phone_number, target_date, exclude_birthdays=False):
             if item.get('eventType') == 'birthday':
                 continue
 
-            start_dt = datetime.datetime.fromisoformat(start_raw['dateTime'])
-            if start_dt.tzinfo is None:
-                start_dt = pytz.UTC.localize(start_dt)
-            start_local = start_dt.astimezone(user_tz)
+            start_local = _parse_event_datetime(start_raw['dateTime']).astimezone(user_tz)
             all_events.append({
                 'start': start_local,
-                'start_str': start_local.strftime('%H:%M'),
+                'start_str': f'{start_local.hour:02d}:{start_local.minute:02d}',
                 'summary': item.get('summary', '(No title)'),
                 'end': end_raw.get('dateTime', end_raw.get('date')),
-                'raw': item,
             })
 
     all_events.sort(key=lambda e: e['start'])
@@ -203,14 +542,10 @@ def create_event(phone_number, target_date, start_time_str, end_time_str, title,
         phone_number, target_date, start_time_str, end_time_str, title,
     )
 
-    token = CalendarToken.objects.filter(
-        phone_number=phone_number
-    ).order_by('created_at').first()
+    token, user_tz = _get_primary_token_and_tz(phone_number)
     if token is None:
         return False, 'no_token'
 
-    user_tz = get_user_tz(phone_number)
-
     try:
         start_h, start_m = [int(x) for x in start_time_str.split(':')]
         end_h, end_m = [int(x) for x in end_time_str.split(':')]
@@ -218,17 +553,18 @@ def create_event(phone_number, target_date, start_time_str, end_time_str, title,
         logger.error('create_event: invalid time format: %s', exc)
         return False, 'invalid_time'
 
-    start_dt = user_tz.localize(
-        datetime.datetime(target_date.year, target_date.month, target_date.day, start_h, start_m)
+    start_dt = datetime.datetime(
+        target_date.year, target_date.month, target_date.day, start_h, start_m, tzinfo=user_tz
     )
-    end_dt = user_tz.localize(
-        datetime.datetime(target_date.year, target_date.month, target_date.day, end_h, end_m)
+    end_dt = datetime.datetime(
+        target_date.year, target_date.month, target_date.day, end_h, end_m, tzinfo=user_tz
     )
 
+    tz_name = str(user_tz)
     event_body = {
         'summary': title[:200],
-        'start': {'dateTime': start_dt.isoformat(), 'timeZone': str(user_tz)},
-        'end': {'dateTime': end_dt.isoformat(), 'timeZone': str(user_tz)},
+        'start': {'dateTime': start_dt.isoformat(), 'timeZone': tz_name},
+        'end': {'dateTime': end_dt.isoformat(), 'timeZone': tz_name},
     }
     if description:
         event_body['description'] = description
@@ -237,7 +573,9 @@ def create_event(phone_number, target_date, start_time_str, end_time_str, title,
 
     try:
         service = get_calendar_service(token)
-        created = service.events().insert(calendarId='primary', body=event_body).execute()
+        created = service.events().insert(
+            calendarId='primary', body=event_body, fields='id',
+        ).execute()
         event_id = created.get('id', '')
         logger.info(
             'create_event success: phone=%s event_id=%s title=%r',
@@ -252,25 +590,56 @@ def create_event(phone_number, target_date, start_time_str, end_time_str, title,
         return False, 'api_error'
 
 
+def _birthday_cal_cache_key(token):
+    return f'calendar_bot:birthday_cal_id:{token.pk}'
+
+
+def _find_birthday_calendar_id(token, cal_list):
+    """
+    Return the id of the Birthdays calendar in a calendarList response,
+    or None if the account has none.
+    """
+    cal_items = cal_list.get('items', [])
+    logger.info(
+        'get_birthdays_next_week: phone=%s email=%s calendars_found=%d names=%r',
+        token.phone_number,
+        token.account_email,
+        len(cal_items),
+        [c.get('summary', '') for c in cal_items],
+    )
+    for cal in cal_items:
+        cal_id = cal.get('id', '')
+        cal_summary = cal.get('summary', '').strip()
+        # Match by known Google birthday calendar ID or case-insensitive summary
+        if (
+            cal_id == '#contacts@group.v.calendar.google.com'
+            or cal_summary.lower() == 'birthdays'
+        ):
+            logger.info(
+                'Birthday calendar found: phone=%s email=%s cal_id=%s summary=%r',
+                token.phone_number,
+                token.account_email,
+                cal_id,
+                cal_summary,
+            )
+            return cal_id
+    return None
+
+
 def get_birthdays_next_week(phone_number):
     """
     Fetch birthday events from the user's 'Birthdays' Google Calendar
     for the current Israeli week (Sunday through Saturday).
     Returns a list of dicts with 'summary' and 'date' (formatted string) keys.
     """
-    user_tz = get_user_tz(phone_number)
+    tokens, user_tz = _get_tokens_and_tz(phone_number)
     now_local = datetime.datetime.now(tz=user_tz)
     today = now_local.date()
     # Israeli calendar: week starts on Sunday (Python weekday: Mon=0, ..., Sun=6)
     # (today.weekday() + 1) % 7 gives the number of days since last Sunday
     week_start = today - datetime.timedelta(days=(today.weekday() + 1) % 7)
     week_end = week_start + datetime.timedelta(days=6)
-    time_min = user_tz.localize(
-        datetime.datetime(week_start.year, week_start.month, week_start.day, 0, 0, 0)
-    )
-    time_max = user_tz.localize(
-        datetime.datetime(week_end.year, week_end.month, week_end.day, 23, 59, 59)
-    )
+    time_min, time_max = _local_day_bounds(user_tz, week_start, week_end)
 
     logger.info(
         'get_birthdays_next_week: phone=%s week_start=%s week_end=%s',
@@ -279,65 +648,41 @@ def get_birthdays_next_week(phone_number):
         week_end,
     )
 
-    tokens = list(CalendarToken.objects.filter(phone_number=phone_number).order_by('created_at'))
     if not tokens:
         return []
 
-    all_birthdays = []
-    seen_ids = set()
-
+    _refresh_due_tokens(tokens)
+    token_services = []
     for token in tokens:
         try:
-            service = get_calendar_service(token)
+            token_services.append((token, get_calendar_service(token)))
         except Exception:
             logger.exception(
                 'Failed to get calendar service in get_birthdays_next_week: phone=%s email=%s',
                 phone_number, token.account_email,
             )
-            continue
 
-        try:
-            cal_list = service.calendarList().list().execute()
-        except Exception:
-            logger.exception(
-                'calendarList API error in get_birthdays_next_week: phone=%s email=%s',
-                phone_number, token.account_email,
-            )
-            continue
-
-        birthday_cal_id = None
-        cal_items = cal_list.get('items', [])
-        logger.info(
-            'get_birthdays_next_week: phone=%s email=%s calendars_found=%d names=%r',
-            phone_number,
-            token.account_email,
-            len(cal_items),
-            [c.get('summary', '') for c in cal_items],
-        )
-        for cal in cal_items:
-            cal_id = cal.get('id', '')
-            cal_summary = cal.get('summary', '').strip()
-            # Match by known Google birthday calendar ID or case-insensitive summary
-            if (
-                cal_id == '#contacts@group.v.calendar.google.com'
-                or cal_summary.lower() == 'birthdays'
-            ):
-                birthday_cal_id = cal_id
+    def _birthdays_for_token(token_service):
+        token, service = token_service
+        cache_key = _birthday_cal_cache_key(token)
+        birthday_cal_id = cache.get(cache_key)
+        if birthday_cal_id is None:
+            try:
+                cal_list = service.calendarList().list(fields=_CALENDAR_LIST_FIELDS).execute()
+            except Exception:
+                logger.exception(
+                    'calendarList API error in get_birthdays_next_week: phone=%s email=%s',
+                    phone_number, token.account_email,
+                )
+                return []
+            birthday_cal_id = _find_birthday_calendar_id(token, cal_list)
+            if birthday_cal_id is None:
                 logger.info(
-                    'Birthday calendar found: phone=%s email=%s cal_id=%s summary=%r',
-                    phone_number,
-                    token.account_email,
-                    cal_id,
-                    cal_summary,
+                    'No Birthdays calendar found for phone=%s email=%s',
+                    phone_number, token.account_email,
                 )
-                break
-
-        if birthday_cal_id is None:
-            logger.info(
-                'No Birthdays calendar found for phone=%s email=%s',
-                phone_number, token.account_email,
-            )
-            continue
+                return []
+            cache.set(cache_key, birthday_cal_id, BIRTHDAY_CAL_ID_CACHE_TIMEOUT)
 
         try:
             events_result = service.events().list(
@@ -346,15 +691,25 @@ def get_birthdays_next_week(phone_number):
                 timeMax=time_max.isoformat(),
                 singleEvents=True,
                 orderBy='startTime',
+                fields=_BIRTHDAY_EVENT_FIELDS,
             ).execute()
         except Exception:
+            # The calendar may have been removed; rediscover it next time.
+            cache.delete(cache_key)
             logger.exception(
                 'Birthdays calendar events API error: phone=%s email=%s',
                 phone_number, token.account_email,
             )
-            continue
+            return []
+        return events_result.get('items', [])
 
-        for item in events_result.get('items', []):
+    all_birthdays = []
+    seen_ids = set()
+
+    for items in _map_concurrently(_birthdays_for_token, token_services):
+        if isinstance(items, Exception):
+            continue
+        for item in items:
             event_id = item.get('id', '')
             if event_id in seen_ids:
                 continue
@@ -403,14 +758,10 @@ def get_free_slots_for_date(phone_number, target_date):
 
     timed_events = [ev for ev in events if ev['start'] is not None]
 
-    work_start = user_tz.localize(
-        datetime.datetime(target_date.year, target_date.month, target_date.day,
-                          WORKDAY_START_HOUR, 0, 0)
-    )
-    work_end = user_tz.localize(
-        datetime.datetime(target_date.year, target_date.month, target_date.day,
-                          WORKDAY_END_HOUR, 0, 0)
-    )
+    work_start = datetime.datetime(target_date.year, target_date.month, target_date.day,
+                                   WORKDAY_START_HOUR, 0, 0, tzinfo=user_tz)
+    work_end = datetime.datetime(target_date.year, target_date.month, target_date.day,
+                                 WORKDAY_END_HOUR, 0, 0, tzinfo=user_tz)
 
     if not timed_events:
         return [{'start': f'{WORKDAY_START_HOUR:02d}:00',
@@ -423,7 +774,7 @@ def get_free_slots_for_date(phone_number, target_date):
         ev_end_raw = ev.get('end')
         if ev_end_raw:
             try:
-                ev_end = datetime.datetime.fromisoformat(ev_end_raw).astimezone(user_tz)
+                ev_end = _parse_event_datetime(ev_end_raw).astimezone(user_tz)
             except (ValueError, TypeError):
                 ev_end = ev_start + datetime.timedelta(hours=1)
         else:
@@ -474,27 +825,208 @@ def sync_calendar_snapshot(token, send_alerts=True):
     Debounce: ignore if same event_id updated less than 5 min ago.
     Updates snapshots to latest state.
     If send_alerts=False, snapshots are updated silently (no changes returned).
+
+    Once the token has a sync_token, Google's incremental feed is checked
+    first; if nothing changed inside the window the full fetch is skipped.
     """
-    phone_number = token.phone_number
-    now = datetime.datetime.now(tz=pytz.UTC)
-    debounce_cutoff = now - datetime.timedelta(minutes=5)
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    logger.info('[Sync] Starting snapshot sync for %s', token.phone_number)
+
+    # Fetch events for next 7 days
+    time_min = now
+    time_max = now + datetime.timedelta(days=7)
+
+    next_sync_token = None
+    if token.sync_token:
+        delta = _fetch_sync_delta(token)
+        if delta is not None:
+            delta_items, next_sync_token = delta
+            if not _delta_touches_window(token, delta_items, time_min, time_max):
+                logger.info(
+                    '[Sync] %d incremental change(s), none in the sync window; skipping fetch',
+                    len(delta_items),
+                )
+                _save_sync_token(token, next_sync_token)
+                # Nothing in the window changed, so the cached events still hold
+                cache.touch(_upcoming_cache_key(token), UPCOMING_EVENTS_CACHE_TIMEOUT)
+                return []
+    if not token.sync_token:
+        # Take the cursor before the full fetch so nothing in between is missed
+        next_sync_token = _seed_sync_token(token)
+
+    items = _fetch_events_for_sync(token, time_min, time_max)
+    changes = _apply_snapshot_changes(token, items, now, time_min, time_max, send_alerts)
+    if next_sync_token:
+        _save_sync_token(token, next_sync_token)
+    return changes
+
+
+def _upcoming_cache_key(token):
+    return f'calendar_bot:upcoming:{token.phone_number}:{token.pk}'
+
+
+def _cache_upcoming_events(token, current_events, time_min, time_max):
+    """
+    Keep the timed events seen by a sync, with the window they cover, so the
+    block-command conflict check can run without calling Google.
+    """
+    cache.set(
+        _upcoming_cache_key(token),
+        {
+            'window': (time_min, time_max),
+            'events': [
+                (ev['start_time'], ev['end_time'], ev['title'])
+                for ev in current_events.values()
+            ],
+        },
+        UPCOMING_EVENTS_CACHE_TIMEOUT,
+    )
+
+
+def _cached_conflicts(token, start_dt, end_dt):
+    """
+    Events from the cached sync overlapping [start_dt, end_dt), shaped like
+    events.list items, or None if the cache is missing or does not cover
+    the slot.
+    """
+    cached = cache.get(_upcoming_cache_key(token))
+    if cached is None:
+        return None
+    window_min, window_max = cached['window']
+    if start_dt < window_min or end_dt > window_max:
+        return None
+    return [
+        {'summary': title}
+        for event_start, event_end, title in cached['events']
+        if event_start < end_dt and start_dt < event_end
+    ]
+
+
+def _list_sync_pages(token, **params):
+    """
+    Page through events.list on the primary calendar's incremental-sync
+    feed. Returns (items, nextSyncToken).
+    """
+    service = get_calendar_service(token)
+    items = []
+    page_token = None
+    while True:
+        result = service.events().list(
+            calendarId='primary',
+            pageToken=page_token,
+            **params,
+        ).execute()
+        items.extend(result.get('items', []))
+        page_token = result.get('nextPageToken')
+        if not page_token:
+            return items, result.get('nextSyncToken')
 
-    logger.info('[Sync] Starting snapshot sync for %s', phone_number)
 
+def _seed_sync_token(token):
+    """
+    Page through the whole primary calendar without event bodies to obtain
+    an initial nextSyncToken. Returns None if that fails; the sync carries
+    on with a full fetch either way.
+    """
+    try:
+        _, sync_token = _list_sync_pages(
+            token,
+            maxResults=_SYNC_FEED_PAGE_SIZE,
+            fields='nextPageToken,nextSyncToken',
+        )
+        return sync_token
+    except Exception:
+        logger.exception(
+            '[Sync] Could not seed sync token for phone=%s email=%s',
+            token.phone_number,
+            token.account_email,
+        )
+        return None
+
+
+def _fetch_sync_delta(token):
+    """
+    Return (changed_items, next_sync_token) since token.sync_token, or None
+    if the feed cannot be used (the caller then does a full fetch). An
+    expired cursor (HTTP 410) is cleared so a fresh one is seeded.
+    """
+    try:
+        return _list_sync_pages(
+            token,
+            syncToken=token.sync_token,
+            maxResults=_SYNC_FEED_PAGE_SIZE,
+            fields=_SYNC_DELTA_FIELDS,
+        )
+    except Exception as exc:
+        if isinstance(exc, HttpError) and exc.resp.status == 410:
+            logger.info(
+                '[Sync] Sync token expired for phone=%s email=%s; resyncing in full',
+                token.phone_number,
+                token.account_email,
+            )
+            _save_sync_token(token, None)
+            return None
+        logger.exception(
+            '[Sync] Incremental sync failed for phone=%s email=%s',
+            token.phone_number,
+            token.account_email,
+        )
+        return None
+
+
+def _delta_touches_window(token, delta_items, time_min, time_max):
+    """
+    True if any incremental change could alter the snapshots in the window:
+    an event we already track there, a recurring series, or a timed event
+    now starting inside the window.
+    """
+    if not delta_items:
+        return False
+    for item in delta_items:
+        if 'recurrence' in item:
+            return True
+        if item.get('status') == 'cancelled':
+            continue
+        start = item.get('start', {}).get('dateTime')
+        if start and time_min <= _parse_event_datetime(start) <= time_max:
+            return True
+    changed_ids = [item['id'] for item in delta_items if item.get('id')]
+    tracked = Q(event_id__in=changed_ids)
+    # A deleted series arrives as its master id only, while snapshots hold
+    # the '<master>_<start>' instance ids from the singleEvents fetch.
+    for item in delta_items:
+        if item.get('status') == 'cancelled' and item.get('id'):
+            tracked |= Q(event_id__startswith=f"{item['id']}_")
+    return token.event_snapshots.filter(
+        tracked,
+        start_time__gte=time_min,
+        start_time__lte=time_max,
+    ).exists()
+
+
+def _save_sync_token(token, sync_token):
+    if token.sync_token == sync_token:
+        return
+    token.sync_token = sync_token
+    # update() rather than save(): no need to touch updated_at or fire signals
+    CalendarToken.objects.filter(pk=token.pk).update(sync_token=sync_token)
+
+
+def _fetch_events_for_sync(token, time_min, time_max):
+    """
+    Return the raw primary-calendar items for token between time_min and
+    time_max. No snapshot rows are touched; errors are logged and re-raised.
+    """
     try:
         service = get_calendar_service(token)
     except Exception:
         logger.exception(
             'Failed to get calendar service in sync_calendar_snapshot: phone=%s email=%s',
-            phone_number,
+            token.phone_number,
             token.account_email,
         )
         raise
 
-    # Fetch events for next 7 days
-    time_min = now
-    time_max = now + datetime.timedelta(days=7)
-
     try:
         events_result = service.events().list(
             calendarId='primary',
@@ -502,42 +1034,50 @@ def sync_calendar_snapshot(token, send_alerts=True):
             timeMax=time_max.isoformat(),
             singleEvents=True,
             orderBy='startTime',
+            timeZone='UTC',
+            fields=_SYNC_EVENT_FIELDS,
         ).execute()
     except Exception:
         logger.exception(
             'Google Calendar API error in sync_calendar_snapshot: phone=%s email=%s',
-            phone_number,
+            token.phone_number,
             token.account_email,
         )
         raise
+    return events_result.get('items', [])
+
+
+def _apply_snapshot_changes(token, items, now, time_min, time_max, send_alerts):
+    """
+    Diff fetched items against token's stored snapshots in the window, write
+    the differences and return the change list (see sync_calendar_snapshot).
+    """
+    phone_number = token.phone_number
+    debounce_cutoff = now - datetime.timedelta(minutes=5)
 
     # Build a dict of current events from Google {event_id -> event_item}
     current_events = {}
     all_day_skipped = 0
-    for item in events_result.get('items', []):
+    parse, utc, empty = _parse_event_datetime, datetime.timezone.utc, {}
+    for item in items:
         event_id = item.get('id')
         if not event_id:
             continue
-        start_raw = item.get('start', {})
-        end_raw = item.get('end', {})
+        start_raw = item.get('start', empty)
+        end_raw = item.get('end', empty)
         if 'dateTime' not in start_raw or 'dateTime' not in end_raw:
             # Skip all-day events for snapshot tracking
             all_day_skipped += 1
             continue
-        start_dt = datetime.datetime.fromisoformat(start_raw['dateTime'])
-        end_dt = datetime.datetime.fromisoformat(end_raw['dateTime'])
-        if start_dt.tzinfo is None:
-            start_dt = pytz.UTC.localize(start_dt)
-        if end_dt.tzinfo is None:
-            end_dt = pytz.UTC.localize(end_dt)
         current_events[event_id] = {
-            'event_id': event_id,
-            'title': item.get('summary', '(No title)'),
-            'start_time': start_dt.astimezone(pytz.UTC),
-            'end_time': end_dt.astimezone(pytz.UTC),
+            'title': item['summary'] if 'summary' in item else '(No title)',
+            'start_time': parse(start_raw['dateTime']).astimezone(utc),
+            'end_time': parse(end_raw['dateTime']).astimezone(utc),
         }
 
-    total_items = len(events_result.get('items', []))
+    _cache_upcoming_events(token, current_events, time_min, time_max)
+
+    total_items = len(items)
     timed_count = len(current_events)
     logger.info(
         '[Sync] Google returned %d events (%d timed, %d all-day skipped)',
@@ -546,65 +1086,82 @@ def sync_calendar_snapshot(token, send_alerts=True):
         all_day_skipped,
     )
 
-    # Load existing snapshots scoped to this specific token and time window.
-    existing_snapshots = {
-        snap.event_id: snap
-        for snap in CalendarEventSnapshot.objects.filter(
-            phone_number=phone_number,
-            token=token,
-            start_time__gte=time_min,
-            start_time__lte=time_max,
-        )
-    }
-
     changes = []
     new_ct = 0
     reschedule_ct = 0
     cancel_ct = 0
-
-    # Detect new events and rescheduled events
-    for event_id, current in current_events.items():
-        snap = existing_snapshots.get(event_id)
-
-        if snap is None:
-            # New event — create snapshot
-            CalendarEventSnapshot.objects.create(
+    to_create = []
+    to_update = []
+
+    with transaction.atomic():
+        # Load the live snapshots scoped to this specific token and time window,
+        # locked so a concurrent sync of the same token waits for this one.
+        # Cancelled rows are history and stay out of the diff; an event that
+        # comes back is re-inserted by the upsert below and reported as new.
+        # Going through the related manager attaches `token` to every row,
+        # so snap.token never costs a query (and needs no JOIN).
+        existing_snapshots = {
+            snap.event_id: snap
+            for snap in token.event_snapshots.select_for_update().filter(
                 phone_number=phone_number,
-                token=token,
-                event_id=event_id,
-                title=current['title'],
-                start_time=current['start_time'],
-                end_time=current['end_time'],
                 status='active',
-            )
-            if send_alerts:
-                new_ct += 1
-                changes.append({
-                    'type': 'new',
-                    'event_id': event_id,
-                    'title': current['title'],
-                    'old_start': None,
-                    'new_start': current['start_time'],
-                })
-        elif snap.status == 'cancelled':
-            # Was cancelled but now active again — treat as new
-            snap.title = current['title']
-            snap.start_time = current['start_time']
-            snap.end_time = current['end_time']
-            snap.status = 'active'
-            snap.save()
-            if send_alerts:
-                new_ct += 1
-                changes.append({
-                    'type': 'new',
-                    'event_id': event_id,
-                    'title': current['title'],
-                    'old_start': None,
-                    'new_start': current['start_time'],
-                })
-        else:
-            # Check for reschedule — compare start_time
-            if snap.start_time != current['start_time']:
+                start_time__gte=time_min,
+                start_time__lte=time_max,
+            ).only('token', 'event_id', 'title', 'start_time', 'end_time', 'status', 'updated_at')
+        }
+
+        # Detect new events and rescheduled events
+        for event_id, current in current_events.items():
+            snap = existing_snapshots.get(event_id)
+
+            if snap is None:
+                # New event — create snapshot
+                to_create.append(CalendarEventSnapshot(
+                    phone_number=phone_number,
+                    token=token,
+                    event_id=event_id,
+                    title=current['title'],
+                    start_time=current['start_time'],
+                    end_time=current['end_time'],
+                    status='active',
+                ))
+                if send_alerts:
+                    new_ct += 1
+                    changes.append({
+                        'type': 'new',
+                        'event_id': event_id,
+                        'title': current['title'],
+                        'old_start': None,
+                        'new_start': current['start_time'],
+                    })
+            else:
+                # Check for reschedule — compare start_time
+                if snap.start_time != current['start_time']:
+                    # Debounce: skip if updated < 5 min ago
+                    if snap.updated_at > debounce_cutoff:
+                        logger.info(
+                            "[Sync] Debounce: skipping change for event '%s' (within 5-min window)",
+                            event_id,
+                        )
+                        continue
+                    old_start = snap.start_time
+                    snap.title = current['title']
+                    snap.start_time = current['start_time']
+                    snap.end_time = current['end_time']
+                    to_update.append(snap)
+                    if send_alerts:
+                        reschedule_ct += 1
+                        changes.append({
+                            'type': 'rescheduled',
+                            'event_id': event_id,
+                            'title': current['title'],
+                            'old_start': old_start,
+                            'new_start': current['start_time'],
+                        })
+
+        # Detect cancelled events (in snapshot but not in current events)
+        for event_id, snap in existing_snapshots.items():
+            if event_id not in current_events:
                 # Debounce: skip if updated < 5 min ago
                 if snap.updated_at > debounce_cutoff:
                     logger.info(
@@ -612,42 +1169,38 @@ def sync_calendar_snapshot(token, send_alerts=True):
                         event_id,
                     )
                     continue
-                old_start = snap.start_time
-                snap.title = current['title']
-                snap.start_time = current['start_time']
-                snap.end_time = current['end_time']
-                snap.save()
+                snap.status = 'cancelled'
+                to_update.append(snap)
                 if send_alerts:
-                    reschedule_ct += 1
+                    cancel_ct += 1
                     changes.append({
-                        'type': 'rescheduled',
+                        'type': 'cancelled',
                         'event_id': event_id,
-                        'title': current['title'],
-                        'old_start': old_start,
-                        'new_start': current['start_time'],
+                        'title': snap.title,
+                        'old_start': snap.start_time,
+                        'new_start': None,
                     })
 
-    # Detect cancelled events (in snapshot but not in current events)
-    for event_id, snap in existing_snapshots.items():
-        if event_id not in current_events and snap.status == 'active':
-            # Debounce: skip if updated < 5 min ago
-            if snap.updated_at > debounce_cutoff:
-                logger.info(
-                    "[Sync] Debounce: skipping change for event '%s' (within 5-min window)",
-                    event_id,
-                )
-                continue
-            snap.status = 'cancelled'
-            snap.save()
-            if send_alerts:
-                cancel_ct += 1
-                changes.append({
-                    'type': 'cancelled',
-                    'event_id': event_id,
-                    'title': snap.title,
-                    'old_start': snap.start_time,
-                    'new_start': None,
-                })
+        if to_create:
+            # A snapshot may already exist outside the window (e.g. an event
+            # moved in from next week) or as a cancelled row, so upsert on
+            # the unique key.
+            CalendarEventSnapshot.objects.bulk_create(
+                to_create,
+                batch_size=_SNAPSHOT_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['phone_number', 'token', 'event_id'],
+                update_fields=['title', 'start_time', 'end_time', 'status', 'updated_at'],
+            )
+        if to_update:
+            # bulk_update() skips auto_now, and the debounce relies on updated_at
+            for snap in to_update:
+                snap.updated_at = now
+            CalendarEventSnapshot.objects.bulk_update(
+                to_update,
+                fields=['title', 'start_time', 'end_time', 'status', 'updated_at'],
+                batch_size=_SNAPSHOT_BATCH_SIZE,
+            )
 
     logger.info(
         '[Sync] Detected: %d new, %d rescheduled, %d cancelled',
@@ -682,7 +1235,8 @@ def handle_block_command(phone_number, body):
         )
 
     target_date, start_hour, start_min, end_hour, end_min, title = parsed
-    user_tz = get_user_tz(phone_number)
+    # Use first token for the block command; its timezone is the user's
+    token, user_tz = _get_primary_token_and_tz(phone_number)
     now_local = datetime.datetime.now(tz=user_tz)
     today = now_local.date()
 
@@ -709,11 +1263,11 @@ def handle_block_command(phone_number, body):
         return 'You can only block time within the next 7 days.'
 
     # Build timezone-aware start/end datetimes
-    start_dt_local = user_tz.localize(
-        datetime.datetime(target_date.year, target_date.month, target_date.day, start_hour, start_min)
+    start_dt_local = datetime.datetime(
+        target_date.year, target_date.month, target_date.day, start_hour, start_min, tzinfo=user_tz
     )
-    end_dt_local = user_tz.localize(
-        datetime.datetime(target_date.year, target_date.month, target_date.day, end_hour, end_min)
+    end_dt_local = datetime.datetime(
+        target_date.year, target_date.month, target_date.day, end_hour, end_min, tzinfo=user_tz
     )
 
     if end_dt_local <= start_dt_local:
@@ -725,27 +1279,27 @@ def handle_block_command(phone_number, body):
         )
         return 'End time must be after start time.'
 
-    # Use first token for the block command
-    token = CalendarToken.objects.filter(
-        phone_number=phone_number
-    ).order_by('created_at').first()
     if token is None:
         return 'Please connect your Google Calendar first.'
 
-    # Check for conflicts
+    # Check for conflicts, from the last sync's cached events when they
+    # cover the requested slot, otherwise live
+    conflicts = _cached_conflicts(token, start_dt_local, end_dt_local)
     try:
         service = get_calendar_service(token)
-        events_result = service.events().list(
-            calendarId='primary',
-            timeMin=start_dt_local.isoformat(),
-            timeMax=end_dt_local.isoformat(),
-            singleEvents=True,
-            orderBy='startTime',
-        ).execute()
-        conflicts = [
-            item for item in events_result.get('items', [])
-            if 'dateTime' in item.get('start', {})
-        ]
+        if conflicts is None:
+            events_result = service.events().list(
+                calendarId='primary',
+                timeMin=start_dt_local.isoformat(),
+                timeMax=end_dt_local.isoformat(),
+                singleEvents=True,
+                orderBy='startTime',
+                fields=_CONFLICT_EVENT_FIELDS,
+            ).execute()
+            conflicts = [
+                item for item in events_result.get('items', [])
+                if 'dateTime' in item.get('start', {})
+            ]
     except Exception:
         logger.exception('Calendar API error checking conflicts for phone=%s', phone_number)
         return 'Could not check your calendar right now. Please try again later.'
@@ -805,29 +1359,31 @@ def confirm_block_command(phone_number):
         logger.warning('confirm_block_command: no pending confirmation for phone=%s', phone_number)
         return 'No pending block to confirm.'
 
+    # Claim the pending row with a conditional DELETE: if the user replies YES
+    # twice, only the request whose DELETE removed the row carries on.
+    claimed, _ = PendingBlockConfirmation.objects.filter(pk=pending.pk).delete()
+    if not claimed:
+        logger.info('confirm_block_command: pending block already handled for phone=%s', phone_number)
+        return 'No pending block to confirm.'
+
     # Enforce 10-minute expiry window
     if tz.now() - pending.pending_at > dt.timedelta(minutes=10):
-        pending.delete()
         logger.warning('Pending block confirmation expired for phone=%s', phone_number)
         return 'Confirmation expired. Please send the block command again.'
 
     event_data = pending.event_data
-    pending.delete()
 
-    user_tz = get_user_tz(phone_number)
+    token, user_tz = _get_primary_token_and_tz(phone_number)
     start_dt_local = datetime.datetime.fromisoformat(event_data['start'])
     end_dt_local = datetime.datetime.fromisoformat(event_data['end'])
     title = event_data['title']
 
     # Ensure timezone-aware
     if start_dt_local.tzinfo is None:
-        start_dt_local = user_tz.localize(start_dt_local)
+        start_dt_local = start_dt_local.replace(tzinfo=user_tz)
     if end_dt_local.tzinfo is None:
-        end_dt_local = user_tz.localize(end_dt_local)
+        end_dt_local = end_dt_local.replace(tzinfo=user_tz)
 
-    token = CalendarToken.objects.filter(
-        phone_number=phone_number
-    ).order_by('created_at').first()
     if token is None:
         return 'Please connect your Google Calendar first.'
 
@@ -852,13 +1408,17 @@ def _create_calendar_block(phone_number, service, start_dt_local, end_dt_local,
     Returns a confirmation message string.
     """
     title = title[:60]  # enforce max 60 chars
+    tz_name = str(user_tz)
     event_body = {
         'summary': title,
-        'start': {'dateTime': start_dt_local.isoformat(), 'timeZone': str(user_tz)},
-        'end': {'dateTime': end_dt_local.isoformat(), 'timeZone': str(user_tz)},
+        'start': {'dateTime': start_dt_local.isoformat(), 'timeZone': tz_name},
+        'end': {'dateTime': end_dt_local.isoformat(), 'timeZone': tz_name},
     }
     try:
-        created = service.events().insert(calendarId='primary', body=event_body).execute()
+        # Only the new event's id is logged, so skip echoing the full resource back
+        created = service.events().insert(
+            calendarId='primary', body=event_body, fields='id',
+        ).execute()
         logger.info(
             'Calendar block created: phone=%s event_id=%s title=%r start=%s',
             phone_number,
@@ -882,41 +1442,41 @@ def _parse_block_command(body):
       block friday 10am-12pm deep work
       block today 3pm-4pm
       add meeting tomorrow 9am-10am Client call
+      block next monday 9-10am
     Returns (date, start_hour, start_min, end_hour, end_min, title) or None.
     """
-    body_stripped = body.strip()
-    # Strip prefix
-    lower = body_stripped.lower()
-    if lower.startswith('add meeting '):
-        rest = body_stripped[len('add meeting '):].strip()
-    elif lower.startswith('block '):
-        rest = body_stripped[len('block '):].strip()
-    else:
+    parsed = _parse_block_command_text(body)
+    if parsed is None:
         return None
+    date_token, start_hour, start_min, end_hour, end_min, title = parsed
 
-    # Split into tokens: first is date, second is time range, remainder is title
-    tokens = rest.split()
-    if len(tokens) < 2:
+    # Resolve date (relative to today, so never cached)
+    target_date = _resolve_date(date_token, datetime.date.today())
+    if target_date is None:
         return None
 
-    date_token = tokens[0].lower()
-    time_token = tokens[1]
-    title_tokens = tokens[2:]
-    title = ' '.join(title_tokens) if title_tokens else 'Blocked'
+    return target_date, start_hour, start_min, end_hour, end_min, title
 
-    # Resolve date
-    today = datetime.date.today()
-    target_date = _resolve_date(date_token, today)
-    if target_date is None:
+
+@functools.lru_cache(maxsize=1024)
+def _parse_block_command_text(body):
+    """
+    The date-independent part of _parse_block_command. Returns
+    (date_token, start_hour, start_min, end_hour, end_min, title) or None.
+    """
+    m = _BLOCK_CMD_RE.match(body)
+    if not m:
         return None
+    date_token = m.group(1).lower()
+    time_token = m.group(2)
+    title = m.group(3) or 'Blocked'
 
     # Parse time range: patterns like "2-4pm", "10am-12pm", "2:30pm-4pm"
     times = _parse_time_range(time_token)
     if times is None:
         return None
 
-    start_hour, start_min, end_hour, end_min = times
-    return target_date, start_hour, start_min, end_hour, end_min, title
+    return (date_token, *times, title)
 
 
 def _resolve_date(date_token, today):
@@ -926,13 +1486,10 @@ def _resolve_date(date_token, today):
     if date_token == 'tomorrow':
         return today + datetime.timedelta(days=1)
 
-    day_names = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-
     # "next monday" pattern
     if date_token.startswith('next '):
-        day_name = date_token[5:]
-        if day_name in day_names:
-            target_weekday = day_names.index(day_name)
+        target_weekday = _DAY_INDEX.get(date_token[5:])
+        if target_weekday is not None:
             days_ahead = (target_weekday - today.weekday() + 7) % 7
             if days_ahead == 0:
                 days_ahead = 7
@@ -940,8 +1497,8 @@ def _resolve_date(date_token, today):
         return None
 
     # Just day name
-    if date_token in day_names:
-        target_weekday = day_names.index(date_token)
+    target_weekday = _DAY_INDEX.get(date_token)
+    if target_weekday is not None:
         days_ahead = (target_weekday - today.weekday()) % 7
         if days_ahead == 0:
             days_ahead = 7
@@ -958,8 +1515,7 @@ def _parse_time_range(time_str):
     time_str = time_str.lower().strip()
 
     # Split on '-' that separates two time parts
-    pattern = r'^(\d{1,2}(?::\d{2})?(?:am|pm)?)-((\d{1,2})(?::\d{2})?(?:am|pm)?)$'
-    m = re.match(pattern, time_str, re.IGNORECASE)
+    m = _TIME_RANGE_RE.match(time_str)
     if not m:
         return None
 
@@ -1004,7 +1560,7 @@ def _parse_single_time(time_str):
     Parse a single time like "2", "2:30", "2pm", "2:30pm".
     Returns (hour, minute, ampm_str_or_None).
     """
-    m = re.match(r'^(\d{1,2})(?::(\d{2}))?(am|pm)?$', time_str.lower())
+    m = _SINGLE_TIME_RE.match(time_str.lower())
     if not m:
         return None
     hour = int(m.group(1))
@@ -1014,16 +1570,6 @@ def _parse_single_time(time_str):
 
 
 def _is_expired(token_expiry):
-    now = datetime.datetime.now(tz=pytz.UTC)
-    aware_expiry = token_expiry if token_expiry.tzinfo else pytz.UTC.localize(token_expiry)
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    aware_expiry = token_expiry if token_expiry.tzinfo else token_expiry.replace(tzinfo=datetime.timezone.utc)
     return now >= aware_expiry
-
-
-def _get_client_id():
-    from decouple import config
-    return config('GOOGLE_CLIENT_ID')
-
-
-def _get_client_secret():
-    from decouple import config
-    return config('GOOGLE_CLIENT_SECRET')
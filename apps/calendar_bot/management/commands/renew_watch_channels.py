@@ -13,11 +13,18 @@ This is useful for:
 
 Channels that fail to renew (e.g. due to revoked credentials or missing
 WEBHOOK_BASE_URL) are logged as errors but do not abort the run for other tokens.
+
+Each renewal is a blocking HTTPS call to Google, so tokens are renewed on a
+thread pool (--workers, optionally throttled with --qps). Results are reported
+in token order once all calls have finished.
 """
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from django.core.management.base import BaseCommand
 from django.conf import settings
+from django.db import connection
 
 # Imported at module level so tests can patch
 # apps.calendar_bot.management.commands.renew_watch_channels.register_watch_channel
@@ -25,6 +32,21 @@ from apps.calendar_bot.sync import register_watch_channel
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_WORKERS = 16
+
+
+def _renew(token):
+    """
+    Renew one token's channel on a worker thread. Returns the channel (or None)
+    or the raised exception, and closes the thread's DB connection when done.
+    """
+    try:
+        return register_watch_channel(token)
+    except Exception as exc:
+        return exc
+    finally:
+        connection.close()
+
 
 class Command(BaseCommand):
     help = (
@@ -45,12 +67,26 @@ class Command(BaseCommand):
             default=False,
             help='Print what would be done without actually calling the Google API.',
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=DEFAULT_WORKERS,
+            help=f'Number of channels to renew concurrently (default {DEFAULT_WORKERS}).',
+        )
+        parser.add_argument(
+            '--qps',
+            type=float,
+            default=None,
+            help='Maximum number of renewals started per second (optional).',
+        )
 
     def handle(self, *args, **options):
         from apps.calendar_bot.models import CalendarToken
 
         phone_filter = options.get('phone')
         dry_run = options.get('dry_run')
+        workers = max(1, options.get('workers') or DEFAULT_WORKERS)
+        qps = options.get('qps')
 
         webhook_base_url = getattr(settings, 'WEBHOOK_BASE_URL', None)
         if not webhook_base_url:
@@ -83,40 +119,68 @@ class Command(BaseCommand):
         skip_count = 0
         error_count = 0
 
-        for token in tokens:
-            label = f'phone={token.phone_number} email={token.account_email or "(none)"}'
-
-            if dry_run:
-                self.stdout.write(f'[dry-run] Would renew watch channel for {label}')
+        if dry_run:
+            for token in tokens:
+                self.stdout.write(f'[dry-run] Would renew watch channel for {_label(token)}')
                 skip_count += 1
-                continue
-
-            self.stdout.write(f'Renewing watch channel for {label} ...')
-            try:
-                channel = register_watch_channel(token)
-                if channel is None:
-                    # register_watch_channel returns None when WEBHOOK_BASE_URL is missing;
-                    # the guard already logged the error.
-                    skip_count += 1
-                    self.stdout.write(
-                        self.style.WARNING(f'  Skipped (WEBHOOK_BASE_URL guard triggered): {label}')
-                    )
-                else:
-                    success_count += 1
-                    self.stdout.write(
-                        self.style.SUCCESS(
-                            f'  OK: channel_id={channel.channel_id} expiry={channel.expiry}'
-                        )
-                    )
-            except Exception as exc:
+            results = []
+        else:
+            results = self._renew_all(tokens, workers, qps)
+
+        for token, result in results:
+            label = _label(token)
+            if isinstance(result, Exception):
                 error_count += 1
-                logger.exception(
-                    'renew_watch_channels: failed to renew channel for %s: %s', label, exc
+                logger.error(
+                    'renew_watch_channels: failed to renew channel for %s: %s',
+                    label,
+                    result,
+                    exc_info=result,
                 )
                 self.stderr.write(
-                    self.style.ERROR(f'  ERROR for {label}: {type(exc).__name__}: {exc}')
+                    self.style.ERROR(f'  ERROR for {label}: {type(result).__name__}: {result}')
+                )
+            elif result is None:
+                # register_watch_channel returns None when WEBHOOK_BASE_URL is missing;
+                # the guard already logged the error.
+                skip_count += 1
+                self.stdout.write(
+                    self.style.WARNING(f'  Skipped (WEBHOOK_BASE_URL guard triggered): {label}')
+                )
+            else:
+                success_count += 1
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'  OK: {label} channel_id={result.channel_id} expiry={result.expiry}'
+                    )
                 )
 
         self.stdout.write(
             f'\nDone. success={success_count} skipped={skip_count} errors={error_count}'
         )
+
+    def _renew_all(self, tokens, workers, qps):
+        """Renew every token's channel and return (token, result) pairs in token order."""
+        if workers == 1 or len(tokens) == 1:
+            results = []
+            for token in tokens:
+                try:
+                    results.append((token, register_watch_channel(token)))
+                except Exception as exc:
+                    results.append((token, exc))
+                if qps:
+                    time.sleep(1.0 / qps)
+            return results
+
+        self.stdout.write(f'Renewing with {min(workers, len(tokens))} worker(s).')
+        with ThreadPoolExecutor(max_workers=min(workers, len(tokens))) as pool:
+            futures = []
+            for token in tokens:
+                futures.append((token, pool.submit(_renew, token)))
+                if qps:
+                    time.sleep(1.0 / qps)
+        return [(token, future.result()) for token, future in futures]
+
+
+def _label(token):
+    return f'phone={token.phone_number} email={token.account_email or "(none)"}'
@@ -1,13 +1,12 @@
 from django.db import migrations
 
 
-def reset_digest_time(apps, schema_editor):
-    """Set digest time to 20:23 (8:23 PM) for testing."""
-    CalendarToken = apps.get_model('calendar_bot', 'CalendarToken')
-    CalendarToken.objects.all().update(digest_hour=20, digest_minute=23)
-
-
 class Migration(migrations.Migration):
+    """
+    Originally reset every digest time to 20:23 for testing. 0018 overwrites
+    every row with 8:30 right after, so the extra full-table rewrite is
+    skipped; kept as a no-op so the migration graph is unchanged.
+    """
 
     dependencies = [
         ('calendar_bot', '0016_backfill_digest_minute_to_30'),
@@ -15,7 +14,7 @@ class Migration(migrations.Migration):
 
     operations = [
         migrations.RunPython(
-            reset_digest_time,
+            migrations.RunPython.noop,
             reverse_code=migrations.RunPython.noop,
         ),
     ]
@@ -4,7 +4,11 @@ from django.db import migrations
 def set_digest_time_morning(apps, schema_editor):
     """Set digest time to 8:30 AM."""
     CalendarToken = apps.get_model('calendar_bot', 'CalendarToken')
-    CalendarToken.objects.all().update(digest_hour=8, digest_minute=30)
+    # Only rewrite rows that are not already at 8:30
+    CalendarToken.objects.exclude(
+        digest_hour=8,
+        digest_minute=30,
+    ).update(digest_hour=8, digest_minute=30)
 
 
 class Migration(migrations.Migration):
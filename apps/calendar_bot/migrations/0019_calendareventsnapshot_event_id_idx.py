@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_bot', '0018_set_digest_time_8_30_am'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='calendareventsnapshot',
+            index=models.Index(fields=['event_id'], name='cal_snap_event_idx'),
+        ),
+    ]
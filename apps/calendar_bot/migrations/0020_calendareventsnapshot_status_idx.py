@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_bot', '0019_calendareventsnapshot_event_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='calendareventsnapshot',
+            index=models.Index(fields=['status'], name='cal_snap_status_idx'),
+        ),
+    ]
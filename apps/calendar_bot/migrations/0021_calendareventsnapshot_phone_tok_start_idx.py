@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_bot', '0020_calendareventsnapshot_status_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='calendareventsnapshot',
+            index=models.Index(
+                fields=['phone_number', 'token', 'start_time'],
+                name='cal_snap_phone_tok_start_idx',
+            ),
+        ),
+    ]
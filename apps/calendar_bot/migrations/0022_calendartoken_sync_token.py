@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_bot', '0021_calendareventsnapshot_phone_tok_start_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calendartoken',
+            name='sync_token',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    phone_number leads a composite index on both tables, so the single-column
+    indexes added in 0007 only cost writes.
+    """
+
+    dependencies = [
+        ('calendar_bot', '0022_calendartoken_sync_token'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='calendareventsnapshot',
+            name='phone_number',
+            field=models.CharField(max_length=30),
+        ),
+        migrations.AlterField(
+            model_name='calendarwatchchannel',
+            name='phone_number',
+            field=models.CharField(max_length=30),
+        ),
+    ]
@@ -21,6 +21,8 @@ class CalendarToken(models.Model):
     pending_action = models.CharField(max_length=50, null=True, blank=True)
     pending_step = models.IntegerField(null=True, blank=True)
     pending_data = models.JSONField(null=True, blank=True)
+    # Google Calendar incremental-sync cursor for the primary calendar
+    sync_token = models.TextField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -47,7 +49,8 @@ class UserMenuState(models.Model):
 
 
 class CalendarEventSnapshot(models.Model):
-    phone_number = models.CharField(max_length=30, db_index=True)
+    # Indexed as the leading column of unique_together and cal_snap_phone_tok_start_idx
+    phone_number = models.CharField(max_length=30)
     token = models.ForeignKey(
         'CalendarToken',
         null=True,
@@ -63,13 +66,22 @@ class CalendarEventSnapshot(models.Model):
 
     class Meta:
         unique_together = [('phone_number', 'token', 'event_id')]
+        indexes = [
+            models.Index(fields=['event_id'], name='cal_snap_event_idx'),
+            models.Index(fields=['status'], name='cal_snap_status_idx'),
+            models.Index(
+                fields=['phone_number', 'token', 'start_time'],
+                name='cal_snap_phone_tok_start_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'CalendarEventSnapshot({self.phone_number}, {self.event_id})'
 
 
 class CalendarWatchChannel(models.Model):
-    phone_number = models.CharField(max_length=30, db_index=True)
+    # Indexed as the leading column of unique_together
+    phone_number = models.CharField(max_length=30)
     token = models.ForeignKey(
         'CalendarToken',
         null=True,
@@ -1,4 +1,4 @@
-from decouple import config
+from django.conf import settings
 from google_auth_oauthlib.flow import Flow
 
 SCOPES = [
@@ -11,14 +11,14 @@ SCOPES = [
 
 def get_oauth_flow(redirect_uri=None):
     """
-    Build and return a Google OAuth2 Flow using GOOGLE_CLIENT_ID and
-    GOOGLE_CLIENT_SECRET from environment variables.
+    Build and return a Google OAuth2 Flow using the GOOGLE_CLIENT_ID and
+    GOOGLE_CLIENT_SECRET settings.
     Includes openid + userinfo.email scopes to identify the Google account.
     """
     client_config = {
         'web': {
-            'client_id': config('GOOGLE_CLIENT_ID'),
-            'client_secret': config('GOOGLE_CLIENT_SECRET'),
+            'client_id': settings.GOOGLE_CLIENT_ID,
+            'client_secret': settings.GOOGLE_CLIENT_SECRET,
             'auth_uri': 'https://accounts.google.com/o/oauth2/auth',
             'token_uri': 'https://oauth2.googleapis.com/token',
             'redirect_uris': [redirect_uri] if redirect_uri else [],
@@ -2,7 +2,6 @@
 Helpers for natural-language day resolution used by the WhatsApp webhook.
 """
 import datetime
-import pytz
 
 DAY_NAMES = {
     'monday': 0,
@@ -116,18 +115,17 @@ def format_week_view(week_events, week_start, week_end):
     header = f'\u05d4\u05e9\u05d1\u05d5\u05e2 ({start_label}\u2013{end_label}):'
     lines = [header]
 
+    one_day = datetime.timedelta(days=1)
     current = week_start
     while current <= week_end:
         day_name = current.strftime('%a')
-        evs = week_events.get(current, [])
+        evs = week_events.get(current)
         if not evs:
             # Hebrew: פנוי
             lines.append(f'{day_name}: \u05e4\u05e0\u05d5\u05d9')
         else:
-            parts = []
-            for ev in evs:
-                parts.append(f'{ev["start_str"]} {ev["summary"]}')
-            lines.append(f'{day_name}: {chr(44).join(parts)}')
-        current += datetime.timedelta(days=1)
+            events_text = ','.join(f'{ev["start_str"]} {ev["summary"]}' for ev in evs)
+            lines.append(f'{day_name}: {events_text}')
+        current += one_day
 
     return '\n\n'.join(lines)
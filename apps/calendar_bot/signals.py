@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CalendarToken
+
+# calendar_service is imported inside the receivers: this module is loaded
+# from AppConfig.ready(), and importing calendar_service there would pull the
+# Google client libraries into every manage.py invocation.
+
+
+@receiver(post_save, sender=CalendarToken)
+@receiver(post_delete, sender=CalendarToken)
+def invalidate_cached_user_tz(sender, instance, **kwargs):
+    from .calendar_service import invalidate_user_tz
+
+    invalidate_user_tz(instance.phone_number)
+
+
+@receiver(post_delete, sender=CalendarToken)
+def forget_deleted_token_service(sender, instance, **kwargs):
+    from .calendar_service import forget_calendar_service
+
+    forget_calendar_service(instance.pk)
@@ -1,15 +1,24 @@
 import datetime
 import logging
 
-import pytz
 from django.conf import settings
+from django.core.cache import cache
 from twilio.rest import Client
 
 from .calendar_service import get_calendar_service, sync_calendar_snapshot, get_user_tz
 from .models import CalendarWatchChannel
+from .twilio_http import twilio_http_client
 
 logger = logging.getLogger(__name__)
 
+# An alert for the same event, change type and start time is sent at most once
+# in this many seconds, even if overlapping syncs both report the change.
+ALERT_DEDUPE_TIMEOUT = 60 * 5
+
+# Alerts for one sync are joined into a single WhatsApp message, split only
+# where the combined text would pass this length (Twilio's limit is 1600).
+ALERT_MESSAGE_MAX_CHARS = 1500
+
 
 def register_watch_channel(token):
     """
@@ -84,7 +93,7 @@ def register_watch_channel(token):
     expiry_ms = watch_response.get('expiration')
     expiry_dt = None
     if expiry_ms:
-        expiry_dt = datetime.datetime.fromtimestamp(int(expiry_ms) / 1000, tz=pytz.UTC)
+        expiry_dt = datetime.datetime.fromtimestamp(int(expiry_ms) / 1000, tz=datetime.timezone.utc)
 
     new_channel.resource_id = resource_id
     new_channel.expiry = expiry_dt
@@ -104,7 +113,8 @@ def send_change_alerts(phone_number, changes):
     """
     Takes list of changes from sync_calendar_snapshot().
     Only alerts for events today or tomorrow (ignores next-week events).
-    Sends alerts via Twilio WhatsApp.
+    Sends alerts via Twilio WhatsApp, combined into as few messages as
+    ALERT_MESSAGE_MAX_CHARS allows.
     """
     if not changes:
         logger.info('send_change_alerts: no changes to report for phone=%s', phone_number)
@@ -122,14 +132,10 @@ def send_change_alerts(phone_number, changes):
     today = now_local.date()
     tomorrow = today + datetime.timedelta(days=1)
 
-    client = Client(
-        settings.TWILIO_ACCOUNT_SID,
-        settings.TWILIO_AUTH_TOKEN,
-    )
-    from_number = settings.TWILIO_WHATSAPP_NUMBER
-
     alerts_sent = 0
     alerts_skipped = 0
+    # (change_type, event_id, dedupe_key, message) for each alert to deliver
+    pending = []
 
     for change in changes:
         change_type = change.get('type')
@@ -151,7 +157,7 @@ def send_change_alerts(phone_number, changes):
 
         # Convert to user's local timezone
         if relevant_dt_utc.tzinfo is None:
-            relevant_dt_utc = pytz.UTC.localize(relevant_dt_utc)
+            relevant_dt_utc = relevant_dt_utc.replace(tzinfo=datetime.timezone.utc)
         event_local = relevant_dt_utc.astimezone(user_tz)
         event_date = event_local.date()
 
@@ -187,7 +193,7 @@ def send_change_alerts(phone_number, changes):
                 )
                 continue
             if old_start_utc.tzinfo is None:
-                old_start_utc = pytz.UTC.localize(old_start_utc)
+                old_start_utc = old_start_utc.replace(tzinfo=datetime.timezone.utc)
             old_local = old_start_utc.astimezone(user_tz)
             old_time_str = old_local.strftime('%H:%M')
             message = (
@@ -213,27 +219,52 @@ def send_change_alerts(phone_number, changes):
             )
             continue
 
-        try:
-            client.messages.create(
-                from_=from_number,
-                to=phone_number,
-                body=message,
-            )
-            alerts_sent += 1
+        dedupe_key = _alert_sent_cache_key(phone_number, event_id, change_type, relevant_dt_utc)
+        if not cache.add(dedupe_key, True, ALERT_DEDUPE_TIMEOUT):
             logger.info(
-                'Change alert sent: phone=%s type=%s event_id=%s',
-                phone_number,
-                change_type,
-                event_id,
-            )
-        except Exception as exc:
-            logger.exception(
-                'Failed to send change alert: phone=%s event_id=%s type=%s: %s',
+                'send_change_alerts: skipping duplicate alert: phone=%s event_id=%s type=%s',
                 phone_number,
                 event_id,
                 change_type,
-                exc,
             )
+            alerts_skipped += 1
+            continue
+
+        pending.append((change_type, event_id, dedupe_key, message))
+
+    if pending:
+        client = Client(
+            settings.TWILIO_ACCOUNT_SID,
+            settings.TWILIO_AUTH_TOKEN,
+            http_client=twilio_http_client(),
+        )
+        for batch in _batch_alerts(pending):
+            body = '\n\n'.join(message for _, _, _, message in batch)
+            try:
+                client.messages.create(
+                    from_=settings.TWILIO_WHATSAPP_NUMBER,
+                    to=phone_number,
+                    body=body,
+                )
+            except Exception as exc:
+                # Let a later sync try these alerts again
+                for _, _, dedupe_key, _ in batch:
+                    cache.delete(dedupe_key)
+                logger.exception(
+                    'Failed to send change alert: phone=%s event_ids=%s: %s',
+                    phone_number,
+                    [event_id for _, event_id, _, _ in batch],
+                    exc,
+                )
+                continue
+            alerts_sent += len(batch)
+            for change_type, event_id, _, _ in batch:
+                logger.info(
+                    'Change alert sent: phone=%s type=%s event_id=%s',
+                    phone_number,
+                    change_type,
+                    event_id,
+                )
 
     logger.info(
         'send_change_alerts complete: phone=%s alerts_sent=%d alerts_skipped=%d',
@@ -241,3 +272,23 @@ def send_change_alerts(phone_number, changes):
         alerts_sent,
         alerts_skipped,
     )
+
+
+def _alert_sent_cache_key(phone_number, event_id, change_type, start_utc):
+    return f'calendar_bot:alert_sent:{phone_number}:{event_id}:{change_type}:{start_utc.timestamp():.0f}'
+
+
+def _batch_alerts(pending):
+    """Group pending alerts, in order, into batches whose joined text fits one message."""
+    batch = []
+    length = 0
+    for alert in pending:
+        message_len = len(alert[3])
+        if batch and length + 2 + message_len > ALERT_MESSAGE_MAX_CHARS:
+            yield batch
+            batch = []
+            length = 0
+        length += message_len + (2 if batch else 0)  # 2 for the blank-line separator
+        batch.append(alert)
+    if batch:
+        yield batch
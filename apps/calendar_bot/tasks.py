@@ -1,46 +1,66 @@
 import datetime
 import logging
+import time
 from collections import defaultdict
 
-import pytz
 from celery import shared_task
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
 from twilio.rest import Client
 
 from .models import CalendarToken, CalendarWatchChannel
-from .calendar_service import get_events_for_date, get_user_tz
-from .sync import register_watch_channel
+from .calendar_service import (
+    get_events_for_date, get_user_tz, refresh_access_token, refresh_tokens, sync_calendar_snapshot,
+)
+from .sync import register_watch_channel, send_change_alerts
+from .twilio_http import twilio_http_client
 
 logger = logging.getLogger(__name__)
 
+# Google revokes refresh tokens unused for six months. Tokens whose access
+# token has not been refreshed for this long are refreshed by
+# keep_refresh_tokens_alive, which runs monthly.
+REFRESH_TOKEN_IDLE_LIMIT = datetime.timedelta(days=120)
+
+# keep_refresh_tokens_alive refreshes this many tokens per second at most.
+KEEPALIVE_BATCH_SIZE = 10
+
+# refresh_expiring_tokens only warms tokens whose phone has a morning
+# digest due within this many minutes. Other tokens refresh on demand.
+DIGEST_REFRESH_LEAD_MINUTES = 10
+
+# Push notifications for a token within this many seconds of the first one
+# share a single sync, which runs at the end of the window.
+SYNC_COALESCE_SECONDS = 30
+
+# Per-worker cap on watch channel renewals, to stay inside Google's quota.
+WATCH_RENEWAL_RATE_LIMIT = '20/s'
+
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
 def send_morning_meetings_digest(self):
     """
-    Send each connected user their meetings for today via WhatsApp.
-    Groups tokens by phone_number and sends ONE merged digest per phone.
+    Queue a digest for each connected user whose digest time is now.
+    Groups tokens by phone_number and queues ONE send_phone_digest per phone,
+    so users are served in parallel by the workers and one slow calendar or
+    Twilio call does not hold up everyone else's digest.
     Respects per-user digest_enabled, digest_hour/minute (from the first/primary token).
     Registered in django-celery-beat -- runs every minute; per-user time check is inside.
     """
     logger.info('send_morning_meetings_digest task started')
 
     try:
-        all_tokens = list(CalendarToken.objects.filter(digest_enabled=True).order_by('phone_number', 'created_at'))
-    except Exception as exc:
-        logger.exception('Failed to query CalendarToken table: %s', exc)
-        raise self.retry(exc=exc)
-
-    try:
-        client = Client(
-            settings.TWILIO_ACCOUNT_SID,
-            settings.TWILIO_AUTH_TOKEN,
+        all_tokens = list(
+            CalendarToken.objects.filter(digest_enabled=True)
+            .order_by('phone_number', 'created_at')
+            .only('phone_number', 'digest_hour', 'digest_minute')
         )
     except Exception as exc:
-        logger.exception('Failed to initialise Twilio client: %s', exc)
+        logger.exception('Failed to query CalendarToken table: %s', exc)
         raise self.retry(exc=exc)
 
-    from_number = settings.TWILIO_WHATSAPP_NUMBER
-    now_utc = datetime.datetime.now(tz=pytz.UTC)
+    now_utc = datetime.datetime.now(tz=datetime.timezone.utc)
 
     # Group tokens by phone; first token in list is primary (earliest created_at)
     phone_to_tokens = defaultdict(list)
@@ -52,7 +72,7 @@ def send_morning_meetings_digest(self):
         len(phone_to_tokens),
     )
 
-    processed = 0
+    queued = 0
     skipped = 0
 
     for phone_number, tokens in phone_to_tokens.items():
@@ -67,38 +87,65 @@ def send_morning_meetings_digest(self):
                 continue
 
             logger.info(
-                'Sending digest to phone=%s (digest_time=%02d:%02d)',
+                'Queueing digest for phone=%s (digest_time=%02d:%02d)',
                 phone_number,
                 primary_token.digest_hour,
                 primary_token.digest_minute,
             )
-            _send_digest_for_phone(client, from_number, phone_number, primary_token)
-            processed += 1
+            send_phone_digest.delay(phone_number)
+            queued += 1
         except Exception:
-            logger.exception('Error sending morning digest to phone=%s', phone_number)
+            logger.exception('Error queueing morning digest for phone=%s', phone_number)
 
     logger.info(
-        'send_morning_meetings_digest task complete: processed=%d skipped=%d',
-        processed,
+        'send_morning_meetings_digest task complete: queued=%d skipped=%d',
+        queued,
         skipped,
     )
 
 
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def send_phone_digest(self, phone_number):
+    """
+    Send today's merged morning digest to one phone. Queued by
+    send_morning_meetings_digest when the phone's digest time comes up.
+    """
+    primary_token = CalendarToken.objects.filter(
+        phone_number=phone_number,
+    ).order_by('created_at').only('phone_number', 'digest_always').first()
+    if primary_token is None:
+        logger.warning('send_phone_digest: no token for phone=%s', phone_number)
+        return
+
+    try:
+        client = Client(
+            settings.TWILIO_ACCOUNT_SID,
+            settings.TWILIO_AUTH_TOKEN,
+            http_client=twilio_http_client(),
+        )
+    except Exception as exc:
+        logger.exception('Failed to initialise Twilio client: %s', exc)
+        raise self.retry(exc=exc)
+
+    try:
+        _send_digest_for_phone(client, settings.TWILIO_WHATSAPP_NUMBER, phone_number, primary_token)
+    except Exception as exc:
+        logger.exception('Error sending morning digest to phone=%s: %s', phone_number, exc)
+        raise self.retry(exc=exc)
+
+
 def _send_digest_for_phone(client, from_number, phone_number, primary_token):
     """
     Send a merged morning digest for all connected accounts of the given phone.
     Uses get_events_for_date which already loops all tokens and merges events.
+    Google and Twilio errors propagate so send_phone_digest can retry.
     """
     user_tz = get_user_tz(phone_number)
     today = datetime.datetime.now(tz=user_tz).date()
 
     logger.info('_send_digest_for_phone: phone=%s date=%s', phone_number, today)
 
-    try:
-        items = get_events_for_date(phone_number, today)
-    except Exception as exc:
-        logger.warning('Could not get events for phone=%s date=%s: %s', phone_number, today, exc)
-        return
+    items = get_events_for_date(phone_number, today)
 
     logger.info(
         '_send_digest_for_phone: phone=%s date=%s events_found=%d',
@@ -108,10 +155,9 @@ def _send_digest_for_phone(client, from_number, phone_number, primary_token):
     )
 
     # Fresh DB query to find the first non-empty name for this phone
-    token_with_name = CalendarToken.objects.filter(
+    user_name = CalendarToken.objects.filter(
         phone_number=phone_number
-    ).exclude(name='').order_by('created_at').first()
-    user_name = token_with_name.name if token_with_name else ''
+    ).exclude(name='').order_by('created_at').values_list('name', flat=True).first() or ''
     name_part = f' {user_name}' if user_name else ''
 
     # Skip if no meetings and user hasn't opted into always-send
@@ -147,79 +193,243 @@ def _send_digest_for_phone(client, from_number, phone_number, primary_token):
 
         message = '\n'.join(lines) + closing
 
-    try:
-        client.messages.create(
-            from_=from_number,
-            to=phone_number,
-            body=message,
-        )
-        logger.info(
-            'Morning digest sent: phone=%s date=%s events=%d',
-            phone_number,
-            today,
-            len(items),
-        )
-    except Exception as exc:
-        logger.exception(
-            'Failed to send morning digest to phone=%s: %s',
-            phone_number,
-            exc,
-        )
+    client.messages.create(
+        from_=from_number,
+        to=phone_number,
+        body=message,
+    )
+    logger.info(
+        'Morning digest sent: phone=%s date=%s events=%d',
+        phone_number,
+        today,
+        len(items),
+    )
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
 def renew_watch_channels(self):
     """
     Runs daily. Finds CalendarWatchChannel records expiring within 24 hours
-    and renews them by calling register_watch_channel(token).
+    and queues one renew_token_watch_channel task per token, so renewals run
+    in parallel on the workers and each retries on its own.
     Skips NULL-token channels (legacy/orphaned).
     """
 
     logger.info('renew_watch_channels task started')
 
-    now = datetime.datetime.now(tz=pytz.UTC)
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
     expiry_threshold = now + datetime.timedelta(hours=24)
 
-    # Only renew channels that have a valid token FK
-    expiring_channels = CalendarWatchChannel.objects.select_related('token').filter(
-        expiry__lt=expiry_threshold,
-        token__isnull=False,
+    # Only renew channels that have a valid token FK; renewing a token
+    # replaces all of its channels, so each token is queued once
+    token_pks = list(
+        CalendarWatchChannel.objects.filter(
+            expiry__lt=expiry_threshold,
+            token__isnull=False,
+        ).order_by('token_id').values_list('token_id', flat=True).distinct()
     )
 
-    channel_count = expiring_channels.count()
     logger.info(
-        'renew_watch_channels: found %d channel(s) expiring within 24h (with token)',
-        channel_count,
+        'renew_watch_channels: found %d token(s) with channels expiring within 24h',
+        len(token_pks),
     )
 
-    renewed = 0
-    failed = 0
-
-    for channel in expiring_channels:
-        token = channel.token
+    queued = 0
+    for token_pk in token_pks:
         try:
-            register_watch_channel(token)
-            renewed += 1
-            logger.info(
-                'Renewed watch channel for phone=%s email=%s',
-                token.phone_number,
-                token.account_email,
-            )
-        except Exception as exc:
-            failed += 1
-            logger.exception(
-                'Failed to renew watch channel for phone=%s email=%s: %s',
-                token.phone_number,
-                token.account_email,
-                exc,
-            )
-            try:
-                raise self.retry(exc=exc)
-            except Exception:
-                pass
+            renew_token_watch_channel.delay(token_pk)
+            queued += 1
+        except Exception:
+            logger.exception('Failed to queue watch channel renewal for token pk=%s', token_pk)
+
+    logger.info('renew_watch_channels task complete: queued=%d', queued)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60, rate_limit=WATCH_RENEWAL_RATE_LIMIT)
+def renew_token_watch_channel(self, token_pk):
+    """Re-register one token's watch channel. Queued by renew_watch_channels."""
+    token = CalendarToken.objects.filter(pk=token_pk).first()
+    if token is None:
+        logger.warning('renew_token_watch_channel: token pk=%s no longer exists', token_pk)
+        return
+
+    try:
+        register_watch_channel(token)
+    except Exception as exc:
+        logger.exception(
+            'Failed to renew watch channel for phone=%s email=%s: %s',
+            token.phone_number,
+            token.account_email,
+            exc,
+        )
+        raise self.retry(exc=exc)
+
+    logger.info(
+        'Renewed watch channel for phone=%s email=%s',
+        token.phone_number,
+        token.account_email,
+    )
+
+
+@shared_task
+def refresh_expiring_tokens():
+    """
+    Runs every 5 minutes. Refreshes access tokens that expire within the
+    next 10 minutes for phones whose morning digest is due within
+    DIGEST_REFRESH_LEAD_MINUTES, so the digest finds a fresh token instead
+    of blocking on a refresh. Other tokens are refreshed in the background
+    by get_calendar_service when they are next used, which keeps idle
+    accounts off the OAuth endpoint. Tokens that expired more than a day ago
+    (e.g. revoked access) are left to the request path.
+    """
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    expiring_tokens = list(
+        CalendarToken.objects.filter(
+            token_expiry__lt=now + datetime.timedelta(minutes=10),
+            token_expiry__gt=now - datetime.timedelta(days=1),
+        ).exclude(refresh_token='')
+    )
+    if expiring_tokens:
+        due_phones = _phones_with_digest_due(
+            {token.phone_number for token in expiring_tokens}, now,
+        )
+        expiring_tokens = [t for t in expiring_tokens if t.phone_number in due_phones]
+
+    # Failures are logged per token inside refresh_tokens
+    refreshed = len(refresh_tokens(expiring_tokens))
+    failed = len(expiring_tokens) - refreshed
 
     logger.info(
-        'renew_watch_channels task complete: renewed=%d failed=%d',
-        renewed,
+        'refresh_expiring_tokens complete: refreshed=%d failed=%d',
+        refreshed,
         failed,
     )
+
+
+def _phones_with_digest_due(phone_numbers, now_utc):
+    """
+    The phones whose morning digest is due within DIGEST_REFRESH_LEAD_MINUTES.
+    Uses the same primary token and timezone as send_morning_meetings_digest.
+    """
+    primary_tokens = {}
+    for token in (
+        CalendarToken.objects.filter(phone_number__in=phone_numbers, digest_enabled=True)
+        .order_by('phone_number', 'created_at')
+        .only('phone_number', 'digest_hour', 'digest_minute')
+    ):
+        primary_tokens.setdefault(token.phone_number, token)
+
+    due = set()
+    for phone_number, primary_token in primary_tokens.items():
+        now_local = now_utc.astimezone(get_user_tz(phone_number))
+        minutes_until = (
+            primary_token.digest_hour * 60 + primary_token.digest_minute
+            - (now_local.hour * 60 + now_local.minute)
+        ) % (24 * 60)
+        if minutes_until < DIGEST_REFRESH_LEAD_MINUTES:
+            due.add(phone_number)
+    return due
+
+
+@shared_task
+def refresh_calendar_token(token_pk):
+    """
+    Refresh a single token's access token. Queued by get_calendar_service
+    when a token is close to expiry but still usable, so the request that
+    noticed it does not wait on Google.
+    """
+    token = CalendarToken.objects.filter(pk=token_pk).first()
+    if token is None or not token.refresh_token:
+        return
+    try:
+        refresh_access_token(token)
+    except Exception:
+        # refresh_access_token already logged the failure
+        pass
+
+
+def _sync_queued_cache_key(token_pk):
+    return f'calendar_bot:sync_queued:{token_pk}'
+
+
+def queue_token_sync(token_pk):
+    """
+    Queue sync_token_changes for a token unless one is already waiting.
+
+    Google often sends several pushes for one edit. The first push queues a
+    sync delayed by SYNC_COALESCE_SECONDS and later ones are dropped until it
+    starts; since the sync pulls everything changed up to when it runs, the
+    dropped pushes are covered. Returns True if a sync was queued.
+    """
+    cache_key = _sync_queued_cache_key(token_pk)
+    # The flag outlives the countdown only so a lost task cannot block syncs for long
+    if not cache.add(cache_key, True, SYNC_COALESCE_SECONDS * 2):
+        return False
+    try:
+        sync_token_changes.apply_async((token_pk,), countdown=SYNC_COALESCE_SECONDS)
+    except Exception:
+        cache.delete(cache_key)
+        raise
+    return True
+
+
+@shared_task
+def sync_token_changes(token_pk):
+    """
+    Sync one token's event snapshot and alert its phone about the changes.
+    Queued through queue_token_sync by CalendarNotificationsView when the
+    token's watch channel fires, so the push notification is acknowledged
+    without waiting on Google or Twilio.
+    """
+    # Pushes from here on may carry changes this sync will miss; let them queue another
+    cache.delete(_sync_queued_cache_key(token_pk))
+
+    token = CalendarToken.objects.filter(pk=token_pk).first()
+    if token is None:
+        logger.warning('sync_token_changes: token pk=%s no longer exists', token_pk)
+        return
+    phone_number = token.phone_number
+
+    try:
+        changes = sync_calendar_snapshot(token)
+    except Exception as exc:
+        logger.exception('Error syncing calendar snapshot for %s: %s', phone_number, exc)
+        return
+
+    logger.info('[CalendarNotif] sync returned %d change(s) for %s', len(changes), phone_number)
+
+    try:
+        send_change_alerts(phone_number, changes)
+    except Exception as exc:
+        logger.exception('Error sending change alerts for %s: %s', phone_number, exc)
+
+
+@shared_task
+def keep_refresh_tokens_alive():
+    """
+    Runs monthly. Refreshes tokens that have not been refreshed for
+    REFRESH_TOKEN_IDLE_LIMIT, so accounts with no recent activity do not
+    lose their refresh token to Google's six-month inactivity rule. A
+    refresh sets token_expiry about an hour ahead, so an old expiry marks
+    an idle token. Works in batches of KEEPALIVE_BATCH_SIZE a second to
+    stay clear of the OAuth endpoint's rate limits.
+    """
+    cutoff = datetime.datetime.now(tz=datetime.timezone.utc) - REFRESH_TOKEN_IDLE_LIMIT
+    idle_tokens = list(
+        CalendarToken.objects.filter(
+            Q(token_expiry__lt=cutoff) | Q(token_expiry__isnull=True)
+        ).exclude(refresh_token='').order_by('pk')
+    )
+
+    refreshed = 0
+    for start in range(0, len(idle_tokens), KEEPALIVE_BATCH_SIZE):
+        if start:
+            time.sleep(1)
+        # Failures are logged per token inside refresh_tokens
+        refreshed += len(refresh_tokens(idle_tokens[start:start + KEEPALIVE_BATCH_SIZE]))
+
+    logger.info(
+        'keep_refresh_tokens_alive complete: refreshed=%d failed=%d',
+        refreshed,
+        len(idle_tokens) - refreshed,
+    )
@@ -8,6 +8,7 @@ Covers:
 - Birthday events are returned correctly when calendar is found
 - Deduplication across multiple tokens (seen_ids set)
 - calendarList API failure is handled gracefully (skip token, try next)
+- Birthday calendar id is cached per token (calendarList skipped when warm)
 
 All Google API and credential calls are mocked; no real HTTP is made.
 """
@@ -15,6 +16,7 @@ import datetime
 from unittest.mock import patch, MagicMock, call
 
 import pytz
+from django.core.cache import cache
 from django.test import TestCase, override_settings
 
 from apps.calendar_bot.models import CalendarToken
@@ -66,6 +68,7 @@ class BirthdayCalendarDetectionTests(TestCase):
     PHONE = '+15550001111'
 
     def setUp(self):
+        cache.clear()
         self.token = _make_token(self.PHONE, email='birthday_test@example.com', tz='UTC')
 
     @patch('apps.calendar_bot.calendar_service.get_calendar_service')
@@ -226,3 +229,51 @@ class BirthdayCalendarDetectionTests(TestCase):
         self.assertIn('calendars_found', log_output)
         # Verify the birthday calendar was logged as found
         self.assertIn('Birthday calendar found', log_output)
+
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_calendarlist_requests_only_id_and_summary(self, mock_get_svc):
+        from apps.calendar_bot.calendar_service import get_birthdays_next_week
+
+        mock_service = _make_service_mock([{'id': 'bday_cal_id', 'summary': 'Birthdays'}], [])
+        mock_get_svc.return_value = mock_service
+
+        get_birthdays_next_week(self.PHONE)
+
+        self.assertEqual(
+            mock_service.calendarList().list.call_args.kwargs, {'fields': 'items(id,summary)'}
+        )
+
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_cached_calendar_id_skips_calendarlist(self, mock_get_svc):
+        """The second lookup reuses the cached calendar id without calendarList."""
+        from apps.calendar_bot.calendar_service import get_birthdays_next_week
+
+        cal_list = [{'id': GOOGLE_BIRTHDAY_CAL_ID, 'summary': 'Birthdays'}]
+        event = _birthday_event('evt_cached', "Dana's Birthday", '2026-02-24')
+        mock_service = _make_service_mock(cal_list, [event])
+        mock_get_svc.return_value = mock_service
+
+        get_birthdays_next_week(self.PHONE)
+        mock_service.calendarList().list().execute.reset_mock()
+
+        results = get_birthdays_next_week(self.PHONE)
+        self.assertEqual([b['summary'] for b in results], ["Dana's Birthday"])
+        mock_service.calendarList().list().execute.assert_not_called()
+
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_events_error_evicts_cached_calendar_id(self, mock_get_svc):
+        """If the cached calendar fails to list, calendarList is queried again next time."""
+        from apps.calendar_bot.calendar_service import get_birthdays_next_week
+
+        cal_list = [{'id': GOOGLE_BIRTHDAY_CAL_ID, 'summary': 'Birthdays'}]
+        mock_service = _make_service_mock(cal_list, [])
+        mock_get_svc.return_value = mock_service
+
+        get_birthdays_next_week(self.PHONE)
+        mock_service.events().list().execute.side_effect = Exception('Not Found')
+        get_birthdays_next_week(self.PHONE)
+        mock_service.calendarList().list().execute.reset_mock()
+        mock_service.events().list().execute.side_effect = None
+
+        get_birthdays_next_week(self.PHONE)
+        mock_service.calendarList().list().execute.assert_called_once()
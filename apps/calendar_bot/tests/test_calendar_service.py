@@ -6,8 +6,10 @@ Updated for TZA-78 multi-account: sync_calendar_snapshot now takes a token objec
 """
 import datetime
 from unittest.mock import patch, MagicMock
+from zoneinfo import ZoneInfo
 
 import pytz
+from django.core.cache import cache
 from django.test import TestCase, override_settings
 
 from apps.calendar_bot.models import CalendarToken, CalendarEventSnapshot
@@ -42,7 +44,7 @@ class GetUserTzTests(TestCase):
     def test_returns_utc_when_no_token(self):
         from apps.calendar_bot.calendar_service import get_user_tz
         tz = get_user_tz('+9999999999')
-        self.assertEqual(tz, pytz.UTC)
+        self.assertEqual(tz, datetime.timezone.utc)
 
     def test_returns_user_timezone(self):
         from apps.calendar_bot.calendar_service import get_user_tz
@@ -54,7 +56,36 @@ class GetUserTzTests(TestCase):
         from apps.calendar_bot.calendar_service import get_user_tz
         _make_token(phone='+1000000002', tz='Not/AValidTZ', email='tz2@example.com')
         tz = get_user_tz('+1000000002')
-        self.assertEqual(tz, pytz.UTC)
+        self.assertEqual(tz, datetime.timezone.utc)
+
+    def test_invalid_timezone_falls_back_to_utc_for_event_fetch(self):
+        from apps.calendar_bot.calendar_service import _get_tokens_and_tz
+        _make_token(phone='+1000000004', tz='Not/AValidTZ', email='tz4@example.com')
+        tokens, tz = _get_tokens_and_tz('+1000000004')
+        self.assertEqual(len(tokens), 1)
+        self.assertEqual(tz, datetime.timezone.utc)
+
+
+class LocalDayBoundsTests(TestCase):
+
+    def test_dst_change_day_ends_at_local_midnight(self):
+        """Israel springs forward on 2026-03-27; that day is 23 hours long."""
+        from apps.calendar_bot.calendar_service import _local_day_bounds
+
+        tz = ZoneInfo('Asia/Jerusalem')
+        start, end = _local_day_bounds(tz, datetime.date(2026, 3, 27))
+
+        self.assertEqual(start.isoformat(), '2026-03-27T00:00:00+02:00')
+        self.assertEqual(end.isoformat(), '2026-03-27T23:59:59+03:00')
+
+    def test_range_spans_first_to_last_day(self):
+        from apps.calendar_bot.calendar_service import _local_day_bounds
+
+        start, end = _local_day_bounds(
+            datetime.timezone.utc, datetime.date(2026, 2, 22), datetime.date(2026, 2, 28)
+        )
+        self.assertEqual(start.isoformat(), '2026-02-22T00:00:00+00:00')
+        self.assertEqual(end.isoformat(), '2026-02-28T23:59:59+00:00')
 
 
 # -------------------------------------------------------------------------
@@ -227,3 +258,424 @@ class SyncCalendarSnapshotTests(TestCase):
         changes = sync_calendar_snapshot(self.token)
         self.assertEqual(changes, [])
         self.assertFalse(CalendarEventSnapshot.objects.filter(event_id='evt_allday').exists())
+
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_writes_are_batched(self, mock_get_svc):
+        """New snapshots go out in one INSERT and changed ones in one UPDATE."""
+        from apps.calendar_bot.calendar_service import sync_calendar_snapshot
+
+        now = datetime.datetime.now(tz=pytz.UTC)
+        for i in range(3):
+            snap = CalendarEventSnapshot.objects.create(
+                phone_number=self.PHONE,
+                token=self.token,
+                event_id=f'evt_gone_{i}',
+                title='Gone',
+                start_time=now + datetime.timedelta(hours=i + 1),
+                end_time=now + datetime.timedelta(hours=i + 2),
+                status='active',
+            )
+            CalendarEventSnapshot.objects.filter(pk=snap.pk).update(
+                updated_at=now - datetime.timedelta(minutes=10)
+            )
+        events = [
+            make_event(
+                f'evt_batch_{i}', f'Batch {i}',
+                now + datetime.timedelta(hours=i + 1), now + datetime.timedelta(hours=i + 2),
+            )
+            for i in range(5)
+        ]
+        mock_get_svc.return_value = self._make_service_mock(events)
+
+        # SELECT + INSERT + UPDATE, plus the transaction savepoint pair
+        with self.assertNumQueries(5):
+            changes = sync_calendar_snapshot(self.token)
+
+        self.assertEqual(len([c for c in changes if c['type'] == 'new']), 5)
+        self.assertEqual(len([c for c in changes if c['type'] == 'cancelled']), 3)
+        self.assertEqual(
+            CalendarEventSnapshot.objects.filter(token=self.token, status='cancelled').count(), 3
+        )
+
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_event_moved_into_window_updates_existing_snapshot(self, mock_get_svc):
+        """A snapshot stored outside the sync window is upserted, not duplicated."""
+        from apps.calendar_bot.calendar_service import sync_calendar_snapshot
+
+        now = datetime.datetime.now(tz=pytz.UTC)
+        far_start = now + datetime.timedelta(days=10)
+        CalendarEventSnapshot.objects.create(
+            phone_number=self.PHONE,
+            token=self.token,
+            event_id='evt_moved_in',
+            title='Later Meeting',
+            start_time=far_start,
+            end_time=far_start + datetime.timedelta(hours=1),
+            status='active',
+        )
+        new_start = now + datetime.timedelta(days=1)
+        event = make_event('evt_moved_in', 'Sooner Meeting', new_start, new_start + datetime.timedelta(hours=1))
+        mock_get_svc.return_value = self._make_service_mock([event])
+
+        sync_calendar_snapshot(self.token)
+
+        snap = CalendarEventSnapshot.objects.get(token=self.token, event_id='evt_moved_in')
+        self.assertEqual(snap.title, 'Sooner Meeting')
+        self.assertEqual(snap.start_time, new_start)
+
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_cancelled_event_that_returns_is_reactivated_as_new(self, mock_get_svc):
+        from apps.calendar_bot.calendar_service import sync_calendar_snapshot
+
+        now = datetime.datetime.now(tz=pytz.UTC)
+        start = now + datetime.timedelta(hours=2)
+        CalendarEventSnapshot.objects.create(
+            phone_number=self.PHONE,
+            token=self.token,
+            event_id='evt_back',
+            title='Back Again',
+            start_time=start,
+            end_time=start + datetime.timedelta(hours=1),
+            status='cancelled',
+        )
+        event = make_event('evt_back', 'Back Again', start, start + datetime.timedelta(hours=1))
+        mock_get_svc.return_value = self._make_service_mock([event])
+
+        changes = sync_calendar_snapshot(self.token)
+
+        self.assertEqual([(c['type'], c['event_id']) for c in changes], [('new', 'evt_back')])
+        snaps = CalendarEventSnapshot.objects.filter(token=self.token, event_id='evt_back')
+        self.assertEqual([s.status for s in snaps], ['active'])
+
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_requests_partial_response_in_utc(self, mock_get_svc):
+        from apps.calendar_bot.calendar_service import sync_calendar_snapshot
+
+        mock_service = self._make_service_mock([])
+        mock_get_svc.return_value = mock_service
+
+        sync_calendar_snapshot(self.token)
+
+        kwargs = mock_service.events().list.call_args.kwargs
+        self.assertEqual(kwargs['timeZone'], 'UTC')
+        self.assertEqual(kwargs['fields'], 'items(id,summary,start/dateTime,end/dateTime)')
+
+
+# -------------------------------------------------------------------------
+# sync_calendar_snapshot — incremental sync (syncToken)
+# -------------------------------------------------------------------------
+@override_settings(
+    GOOGLE_CLIENT_ID='fake_client_id',
+    GOOGLE_CLIENT_SECRET='fake_secret',
+)
+class SyncTokenTests(TestCase):
+
+    PHONE = '+1234500000'
+
+    def setUp(self):
+        self.token = _make_token(phone=self.PHONE, email='delta@example.com')
+        self.now = datetime.datetime.now(tz=pytz.UTC)
+        self.window_calls = 0
+
+    def _make_service(self, window_items=(), delta=None, seed='seed-token'):
+        """
+        Fake service whose events().list() answers the seed request, the
+        incremental (syncToken) request and the windowed request.
+        """
+        def list_events(**kwargs):
+            request = MagicMock()
+            if 'syncToken' in kwargs:
+                if isinstance(delta, Exception):
+                    request.execute.side_effect = delta
+                else:
+                    request.execute.return_value = delta
+            elif 'timeMin' in kwargs:
+                self.window_calls += 1
+                request.execute.return_value = {'items': list(window_items)}
+            else:
+                request.execute.return_value = {'nextSyncToken': seed}
+            return request
+
+        service = MagicMock()
+        service.events().list = list_events
+        return service
+
+    def _event(self, event_id, hours_from_now):
+        start = self.now + datetime.timedelta(hours=hours_from_now)
+        return make_event(event_id, 'Meeting', start, start + datetime.timedelta(hours=1))
+
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_first_sync_seeds_sync_token(self, mock_get_svc):
+        from apps.calendar_bot.calendar_service import sync_calendar_snapshot
+
+        mock_get_svc.return_value = self._make_service([self._event('evt_1', 2)])
+
+        changes = sync_calendar_snapshot(self.token)
+
+        self.assertEqual([c['event_id'] for c in changes], ['evt_1'])
+        self.token.refresh_from_db()
+        self.assertEqual(self.token.sync_token, 'seed-token')
+
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_delta_outside_window_skips_full_fetch(self, mock_get_svc):
+        from apps.calendar_bot.calendar_service import sync_calendar_snapshot
+
+        CalendarToken.objects.filter(pk=self.token.pk).update(sync_token='cursor-1')
+        self.token.refresh_from_db()
+        far = self._event('evt_far', 24 * 30)
+        mock_get_svc.return_value = self._make_service(
+            delta={'items': [far], 'nextSyncToken': 'cursor-2'},
+        )
+
+        changes = sync_calendar_snapshot(self.token)
+
+        self.assertEqual(changes, [])
+        self.assertEqual(self.window_calls, 0)
+        self.token.refresh_from_db()
+        self.assertEqual(self.token.sync_token, 'cursor-2')
+
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_delta_for_tracked_event_runs_full_fetch(self, mock_get_svc):
+        from apps.calendar_bot.calendar_service import sync_calendar_snapshot
+
+        CalendarToken.objects.filter(pk=self.token.pk).update(sync_token='cursor-1')
+        self.token.refresh_from_db()
+        snap = CalendarEventSnapshot.objects.create(
+            phone_number=self.PHONE,
+            token=self.token,
+            event_id='evt_tracked',
+            title='Meeting',
+            start_time=self.now + datetime.timedelta(hours=2),
+            end_time=self.now + datetime.timedelta(hours=3),
+            status='active',
+        )
+        CalendarEventSnapshot.objects.filter(pk=snap.pk).update(
+            updated_at=self.now - datetime.timedelta(minutes=10)
+        )
+        mock_get_svc.return_value = self._make_service(
+            delta={'items': [{'id': 'evt_tracked', 'status': 'cancelled'}], 'nextSyncToken': 'cursor-2'},
+        )
+
+        changes = sync_calendar_snapshot(self.token)
+
+        self.assertEqual(self.window_calls, 1)
+        self.assertEqual([c['type'] for c in changes], ['cancelled'])
+        self.token.refresh_from_db()
+        self.assertEqual(self.token.sync_token, 'cursor-2')
+
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_cancelled_series_with_tracked_instances_runs_full_fetch(self, mock_get_svc):
+        from apps.calendar_bot.calendar_service import sync_calendar_snapshot
+
+        CalendarToken.objects.filter(pk=self.token.pk).update(sync_token='cursor-1')
+        self.token.refresh_from_db()
+        start = self.now + datetime.timedelta(hours=2)
+        snap = CalendarEventSnapshot.objects.create(
+            phone_number=self.PHONE,
+            token=self.token,
+            event_id=f"series_{start.strftime('%Y%m%dT%H%M%SZ')}",
+            title='Weekly sync',
+            start_time=start,
+            end_time=start + datetime.timedelta(hours=1),
+            status='active',
+        )
+        CalendarEventSnapshot.objects.filter(pk=snap.pk).update(
+            updated_at=self.now - datetime.timedelta(minutes=10)
+        )
+        mock_get_svc.return_value = self._make_service(
+            delta={'items': [{'id': 'series', 'status': 'cancelled'}], 'nextSyncToken': 'cursor-2'},
+        )
+
+        changes = sync_calendar_snapshot(self.token)
+
+        self.assertEqual(self.window_calls, 1)
+        self.assertEqual([(c['type'], c['event_id']) for c in changes], [('cancelled', snap.event_id)])
+
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_expired_sync_token_triggers_full_resync(self, mock_get_svc):
+        from googleapiclient.errors import HttpError
+        from apps.calendar_bot.calendar_service import sync_calendar_snapshot
+
+        CalendarToken.objects.filter(pk=self.token.pk).update(sync_token='stale')
+        self.token.refresh_from_db()
+        gone = HttpError(resp=MagicMock(status=410), content=b'Sync token is no longer valid')
+        mock_get_svc.return_value = self._make_service(
+            [self._event('evt_again', 3)], delta=gone, seed='fresh-token',
+        )
+
+        changes = sync_calendar_snapshot(self.token)
+
+        self.assertEqual(self.window_calls, 1)
+        self.assertEqual([c['event_id'] for c in changes], ['evt_again'])
+        self.token.refresh_from_db()
+        self.assertEqual(self.token.sync_token, 'fresh-token')
+
+
+# -------------------------------------------------------------------------
+# _parse_block_command
+# -------------------------------------------------------------------------
+class ParseBlockCommandTests(TestCase):
+
+    def test_parses_date_time_and_title(self):
+        from apps.calendar_bot.calendar_service import _parse_block_command
+
+        parsed = _parse_block_command('Add meeting tomorrow 9am-10:30am  Client call ')
+        tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+        self.assertEqual(parsed, (tomorrow, 9, 0, 10, 30, 'Client call'))
+
+    def test_defaults_title_to_blocked(self):
+        from apps.calendar_bot.calendar_service import _parse_block_command
+
+        parsed = _parse_block_command('block today 2-4pm')
+        self.assertEqual(parsed, (datetime.date.today(), 14, 0, 16, 0, 'Blocked'))
+
+    def test_next_weekday(self):
+        from apps.calendar_bot.calendar_service import _parse_block_command
+
+        parsed = _parse_block_command('block next monday 9-10am')
+        self.assertEqual(parsed[0].weekday(), 0)
+        self.assertGreater(parsed[0], datetime.date.today())
+
+    def test_rejects_unknown_prefix_or_missing_time(self):
+        from apps.calendar_bot.calendar_service import _parse_block_command
+
+        self.assertIsNone(_parse_block_command('blocked tomorrow 2-4pm'))
+        self.assertIsNone(_parse_block_command('block tomorrow'))
+
+    def test_repeat_command_reuses_text_parse(self):
+        from apps.calendar_bot.calendar_service import (
+            _parse_block_command, _parse_block_command_text,
+        )
+
+        _parse_block_command_text.cache_clear()
+        first = _parse_block_command('block tomorrow 2-4pm Focus')
+        second = _parse_block_command('block tomorrow 2-4pm Focus')
+
+        self.assertEqual(first, second)
+        self.assertEqual(_parse_block_command_text.cache_info().hits, 1)
+
+
+class BlockCommandConflictCacheTests(TestCase):
+
+    PHONE = '+1234500099'
+
+    def setUp(self):
+        cache.clear()
+        self.token = _make_token(phone=self.PHONE, email='block@example.com')
+
+    def _make_service_mock(self, events):
+        mock_service = MagicMock()
+        mock_service.events().list().execute.return_value = {'items': events}
+        return mock_service
+
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_conflict_found_from_synced_events_without_api_call(self, mock_get_svc):
+        from apps.calendar_bot.calendar_service import handle_block_command, sync_calendar_snapshot
+        from apps.calendar_bot.models import PendingBlockConfirmation
+
+        tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+        start = pytz.UTC.localize(datetime.datetime.combine(tomorrow, datetime.time(14, 30)))
+        mock_get_svc.return_value = self._make_service_mock([
+            make_event('evt_busy', 'Busy', start, start + datetime.timedelta(hours=1)),
+        ])
+        sync_calendar_snapshot(self.token, send_alerts=False)
+
+        block_service = MagicMock()
+        mock_get_svc.return_value = block_service
+        reply = handle_block_command(self.PHONE, 'block tomorrow 2-4pm')
+
+        self.assertIn('"Busy"', reply)
+        self.assertTrue(PendingBlockConfirmation.objects.filter(phone_number=self.PHONE).exists())
+        block_service.events().list.assert_not_called()
+
+    @patch('apps.calendar_bot.calendar_service._create_calendar_block', return_value='created')
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_without_synced_events_checks_api(self, mock_get_svc, mock_create):
+        from apps.calendar_bot.calendar_service import handle_block_command
+
+        service = self._make_service_mock([])
+        mock_get_svc.return_value = service
+
+        reply = handle_block_command(self.PHONE, 'block tomorrow 2-4pm')
+
+        self.assertEqual(reply, 'created')
+        self.assertEqual(service.events().list.call_args.kwargs['calendarId'], 'primary')
+
+
+class CreateEventTests(TestCase):
+
+    PHONE = '+1234500100'
+
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_token_and_timezone_loaded_in_one_query(self, mock_get_svc):
+        from apps.calendar_bot.calendar_service import create_event
+
+        _make_token(phone=self.PHONE, tz='Asia/Jerusalem', email='create@example.com')
+        service = MagicMock()
+        service.events().insert().execute.return_value = {'id': 'evt_new'}
+        mock_get_svc.return_value = service
+
+        with self.assertNumQueries(1):
+            result = create_event(self.PHONE, datetime.date(2026, 7, 1), '09:00', '10:00', 'Dentist')
+
+        self.assertEqual(result, (True, 'evt_new'))
+        self.assertEqual(service.events().insert.call_args.kwargs['fields'], 'id')
+        body = service.events().insert.call_args.kwargs['body']
+        self.assertEqual(body['start'], {'dateTime': '2026-07-01T09:00:00+03:00', 'timeZone': 'Asia/Jerusalem'})
+
+
+class ConfirmBlockCommandTests(TestCase):
+
+    PHONE = '+1234500200'
+
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_confirm_loads_token_and_timezone_together(self, mock_get_svc):
+        from apps.calendar_bot.calendar_service import confirm_block_command
+        from apps.calendar_bot.models import PendingBlockConfirmation
+
+        _make_token(phone=self.PHONE, tz='Asia/Jerusalem', email='confirm@example.com')
+        PendingBlockConfirmation.objects.create(
+            phone_number=self.PHONE,
+            event_data={
+                'date': '2026-07-01',
+                'start': '2026-07-01T14:00:00',
+                'end': '2026-07-01T15:00:00',
+                'title': 'Focus',
+            },
+        )
+        service = MagicMock()
+        service.events().insert().execute.return_value = {'id': 'evt_block'}
+        mock_get_svc.return_value = service
+
+        # pending lookup, conditional pending delete, token + timezone
+        with self.assertNumQueries(3):
+            confirm_block_command(self.PHONE)
+
+        body = service.events().insert.call_args.kwargs['body']
+        self.assertEqual(body['start'], {'dateTime': '2026-07-01T14:00:00+03:00', 'timeZone': 'Asia/Jerusalem'})
+        self.assertFalse(PendingBlockConfirmation.objects.filter(phone_number=self.PHONE).exists())
+
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_second_yes_for_the_same_block_creates_nothing(self, mock_get_svc):
+        from apps.calendar_bot.calendar_service import confirm_block_command
+        from apps.calendar_bot.models import PendingBlockConfirmation
+
+        _make_token(phone=self.PHONE, tz='Asia/Jerusalem', email='confirm@example.com')
+        pending = PendingBlockConfirmation.objects.create(
+            phone_number=self.PHONE,
+            event_data={
+                'date': '2026-07-01',
+                'start': '2026-07-01T14:00:00',
+                'end': '2026-07-01T15:00:00',
+                'title': 'Focus',
+            },
+        )
+        # Another request read the same row and has already consumed it
+        stale = PendingBlockConfirmation.objects.get(pk=pending.pk)
+        pending.delete()
+
+        with patch.object(PendingBlockConfirmation.objects, 'get', return_value=stale):
+            result = confirm_block_command(self.PHONE)
+
+        self.assertEqual(result, 'No pending block to confirm.')
+        mock_get_svc.assert_not_called()
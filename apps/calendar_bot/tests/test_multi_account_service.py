@@ -3,6 +3,9 @@ Tests for multi-account calendar service behavior (TZA-78).
 
 Covers:
 - get_user_tz with multiple tokens (no error, uses first token)
+- get_user_tz caching and invalidation on token save/update
+- get_calendar_service reuses a built client while its access token is fresh
+- expiring tokens are refreshed together before events are fetched
 - get_events_for_date merges events from multiple tokens
 - get_events_for_date partial failure (one token fails, others succeed)
 - sync_calendar_snapshot scoped to specific token
@@ -11,7 +14,9 @@ import datetime
 from unittest.mock import patch, MagicMock, call
 
 import pytz
+from django.core.cache import cache
 from django.test import TestCase, override_settings
+from googleapiclient.discovery_cache import get_static_doc
 
 from apps.calendar_bot.models import CalendarToken, CalendarEventSnapshot
 
@@ -22,6 +27,9 @@ from apps.calendar_bot.models import CalendarToken, CalendarEventSnapshot
 )
 class GetUserTzMultiTokenTests(TestCase):
 
+    def setUp(self):
+        cache.clear()
+
     def test_get_user_tz_with_multiple_tokens_uses_first_created(self):
         """
         With two tokens for the same phone, get_user_tz should use the
@@ -51,7 +59,41 @@ class GetUserTzMultiTokenTests(TestCase):
     def test_get_user_tz_no_tokens_returns_utc(self):
         from apps.calendar_bot.calendar_service import get_user_tz
         tz = get_user_tz('+9999000000')
-        self.assertEqual(tz, pytz.UTC)
+        self.assertEqual(tz, datetime.timezone.utc)
+
+    def test_get_user_tz_cached_after_first_lookup(self):
+        from apps.calendar_bot.calendar_service import get_user_tz
+
+        CalendarToken.objects.create(
+            phone_number='+1999000002',
+            account_email='cached@example.com',
+            access_token='a',
+            refresh_token='b',
+            timezone='Asia/Jerusalem',
+        )
+        get_user_tz('+1999000002')
+        with self.assertNumQueries(0):
+            tz = get_user_tz('+1999000002')
+        self.assertEqual(str(tz), 'Asia/Jerusalem')
+
+    def test_get_user_tz_invalidated_on_token_save(self):
+        from apps.calendar_bot.calendar_service import get_user_tz
+
+        token = CalendarToken.objects.create(
+            phone_number='+1999000003',
+            account_email='saved@example.com',
+            access_token='a',
+            refresh_token='b',
+            timezone='UTC',
+        )
+        self.assertEqual(get_user_tz('+1999000003'), datetime.timezone.utc)
+
+        token.timezone = 'Europe/London'
+        token.save(update_fields=['timezone'])
+        self.assertEqual(str(get_user_tz('+1999000003')), 'Europe/London')
+
+        token.delete()
+        self.assertEqual(get_user_tz('+1999000003'), datetime.timezone.utc)
 
 
 @override_settings(
@@ -114,6 +156,8 @@ class GetEventsForDateMultiTokenTests(TestCase):
         titles = [ev['summary'] for ev in events]
         self.assertIn('Work Meeting', titles)
         self.assertIn('Personal Event', titles)
+        # Only the fields callers read are kept, not the whole API item
+        self.assertEqual(set(events[0]), {'start', 'start_str', 'summary', 'end'})
 
     @patch('apps.calendar_bot.calendar_service.get_calendar_service')
     def test_partial_failure_continues_with_other_tokens(self, mock_get_svc):
@@ -150,6 +194,98 @@ class GetEventsForDateMultiTokenTests(TestCase):
         titles = [ev['summary'] for ev in events]
         self.assertIn('OK Meeting', titles)
 
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_list_error_on_one_token_keeps_other_tokens_events(self, mock_get_svc):
+        """
+        Tokens are fetched concurrently; an events.list failure for one
+        account must not drop the events returned for the others.
+        """
+        from apps.calendar_bot.calendar_service import get_events_for_date
+
+        for email in ('broken@example.com', 'ok@example.com'):
+            CalendarToken.objects.create(
+                phone_number=self.PHONE,
+                account_email=email,
+                access_token='a',
+                refresh_token='r',
+            )
+
+        broken_service = MagicMock()
+        broken_service.events().list().execute.side_effect = Exception('HTTP 500')
+        mock_get_svc.side_effect = [
+            broken_service,
+            self._make_service_mock([self._make_event('Still Here', 2)]),
+        ]
+
+        today = datetime.datetime.now(tz=pytz.UTC).date()
+        events = get_events_for_date(self.PHONE, today)
+
+        self.assertEqual([ev['summary'] for ev in events], ['Still Here'])
+
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_tokens_and_timezone_loaded_in_one_query(self, mock_get_svc):
+        from apps.calendar_bot.calendar_service import get_events_for_date
+
+        for email in ('q1@example.com', 'q2@example.com'):
+            CalendarToken.objects.create(
+                phone_number=self.PHONE,
+                account_email=email,
+                access_token='a',
+                refresh_token='r',
+            )
+        mock_get_svc.return_value = self._make_service_mock([])
+
+        today = datetime.datetime.now(tz=pytz.UTC).date()
+        with self.assertNumQueries(1):
+            get_events_for_date(self.PHONE, today)
+
+    def test_tokens_loaded_without_menu_state_columns(self):
+        from apps.calendar_bot.calendar_service import _get_tokens_and_tz
+
+        CalendarToken.objects.create(
+            phone_number=self.PHONE,
+            account_email='cols@example.com',
+            access_token='a',
+            refresh_token='r',
+            pending_data={'step': 'x'},
+        )
+        tokens, _ = _get_tokens_and_tz(self.PHONE)
+
+        self.assertIn('pending_data', tokens[0].get_deferred_fields())
+        self.assertNotIn('access_token', tokens[0].get_deferred_fields())
+
+    @patch('apps.calendar_bot.calendar_service._refresh_credentials')
+    @patch('apps.calendar_bot.calendar_service.get_calendar_service')
+    def test_expired_tokens_refreshed_together_before_fetch(self, mock_get_svc, mock_refresh):
+        from apps.calendar_bot.calendar_service import get_events_for_date
+
+        expired = datetime.datetime.now(tz=pytz.UTC) - datetime.timedelta(minutes=1)
+        for email in ('old1@example.com', 'old2@example.com'):
+            CalendarToken.objects.create(
+                phone_number=self.PHONE,
+                account_email=email,
+                access_token='stale',
+                refresh_token='r',
+                token_expiry=expired,
+            )
+        new_expiry = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+        mock_refresh.return_value = MagicMock(token='fresh', expiry=new_expiry)
+        mock_get_svc.return_value = self._make_service_mock([])
+
+        today = datetime.datetime.now(tz=pytz.UTC).date()
+        # token lookup + one bulk update for both refreshed tokens
+        with self.assertNumQueries(2):
+            get_events_for_date(self.PHONE, today)
+
+        self.assertEqual(mock_refresh.call_count, 2)
+        self.assertEqual(
+            set(CalendarToken.objects.filter(phone_number=self.PHONE)
+                .values_list('access_token', flat=True)),
+            {'fresh'},
+        )
+        for (token,), _ in mock_get_svc.call_args_list:
+            self.assertEqual(token.access_token, 'fresh')
+
     @patch('apps.calendar_bot.calendar_service.get_calendar_service')
     def test_no_tokens_returns_empty_list(self, mock_get_svc):
         from apps.calendar_bot.calendar_service import get_events_for_date
@@ -272,3 +408,128 @@ class SyncCalendarSnapshotMultiTokenTests(TestCase):
         self.assertEqual(changes, [])
         # But snapshot should still be created
         self.assertTrue(CalendarEventSnapshot.objects.filter(event_id='evt_silent').exists())
+
+
+@override_settings(
+    GOOGLE_CLIENT_ID='fake_client_id',
+    GOOGLE_CLIENT_SECRET='fake_secret',
+)
+class GetCalendarServiceCacheTests(TestCase):
+    """
+    get_calendar_service memoizes the built client per token until shortly
+    before the access token expires.
+    """
+
+    def setUp(self):
+        from apps.calendar_bot import calendar_service
+        calendar_service._SERVICE_CACHE.clear()
+        self.token = CalendarToken.objects.create(
+            phone_number='+1666000001',
+            account_email='svc@example.com',
+            access_token='access-1',
+            refresh_token='refresh',
+            token_expiry=datetime.datetime.now(tz=pytz.UTC) + datetime.timedelta(hours=1),
+        )
+
+    @patch('apps.calendar_bot.calendar_service.build_from_document')
+    def test_service_reused_for_same_access_token(self, mock_build):
+        from apps.calendar_bot.calendar_service import get_calendar_service
+
+        first = get_calendar_service(self.token)
+        second = get_calendar_service(self.token)
+
+        self.assertIs(first, second)
+        mock_build.assert_called_once()
+
+    @patch('apps.calendar_bot.calendar_service.build_from_document')
+    def test_service_rebuilt_when_access_token_changes(self, mock_build):
+        from apps.calendar_bot.calendar_service import get_calendar_service
+
+        get_calendar_service(self.token)
+        self.token.access_token = 'access-2'
+        get_calendar_service(self.token)
+
+        self.assertEqual(mock_build.call_count, 2)
+
+    @patch('apps.calendar_bot.tasks.refresh_calendar_token.delay')
+    @patch('apps.calendar_bot.calendar_service.build_from_document')
+    def test_token_about_to_expire_used_and_refreshed_in_background(self, mock_build, mock_delay):
+        from apps.calendar_bot.calendar_service import get_calendar_service
+
+        cache.clear()
+        self.token.token_expiry = datetime.datetime.now(tz=pytz.UTC) + datetime.timedelta(minutes=4)
+
+        with patch('apps.calendar_bot.calendar_service.refresh_access_token') as mock_refresh:
+            get_calendar_service(self.token)
+            get_calendar_service(self.token)
+
+        mock_refresh.assert_not_called()
+        mock_delay.assert_called_once_with(self.token.pk)
+        self.assertEqual(mock_build.call_args.kwargs['credentials'].token, 'access-1')
+
+    @patch('apps.calendar_bot.calendar_service.build_from_document')
+    def test_expired_token_refreshed_once_and_saved(self, mock_build):
+        from apps.calendar_bot.calendar_service import get_calendar_service
+
+        self.token.token_expiry = datetime.datetime.now(tz=pytz.UTC) - datetime.timedelta(minutes=5)
+        self.token.save()
+
+        def fake_refresh(creds, request):
+            creds.token = 'access-refreshed'
+            creds.expiry = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+
+        with patch(
+            'apps.calendar_bot.calendar_service.Credentials.refresh',
+            autospec=True, side_effect=fake_refresh,
+        ) as mock_refresh:
+            get_calendar_service(self.token)
+            get_calendar_service(self.token)
+
+        mock_refresh.assert_called_once()
+        mock_build.assert_called_once()
+        self.token.refresh_from_db()
+        self.assertEqual(self.token.access_token, 'access-refreshed')
+
+    @patch('apps.calendar_bot.calendar_service.build_from_document')
+    def test_least_recently_used_entry_evicted_when_full(self, mock_build):
+        from apps.calendar_bot import calendar_service
+
+        other = CalendarToken.objects.create(
+            phone_number='+1666000002',
+            account_email='svc2@example.com',
+            access_token='access-x',
+            refresh_token='refresh',
+            token_expiry=self.token.token_expiry,
+        )
+        newest = CalendarToken.objects.create(
+            phone_number='+1666000003',
+            account_email='svc3@example.com',
+            access_token='access-y',
+            refresh_token='refresh',
+            token_expiry=self.token.token_expiry,
+        )
+
+        with patch.object(calendar_service, '_SERVICE_CACHE_MAX_ENTRIES', 2):
+            calendar_service.get_calendar_service(self.token)
+            calendar_service.get_calendar_service(other)
+            calendar_service.get_calendar_service(self.token)
+            calendar_service.get_calendar_service(newest)
+
+        self.assertEqual(list(calendar_service._SERVICE_CACHE), [self.token.pk, newest.pk])
+
+    @patch('apps.calendar_bot.calendar_service.get_static_doc', wraps=get_static_doc)
+    def test_discovery_document_read_once(self, mock_get_doc):
+        from apps.calendar_bot.calendar_service import (
+            _calendar_discovery_doc, forget_calendar_service, get_calendar_service,
+        )
+
+        _calendar_discovery_doc.cache_clear()
+        self.addCleanup(_calendar_discovery_doc.cache_clear)
+
+        first = get_calendar_service(self.token)
+        forget_calendar_service(self.token.pk)
+        second = get_calendar_service(self.token)
+
+        self.assertIsNot(first, second)
+        self.assertTrue(hasattr(second.events(), 'list'))
+        mock_get_doc.assert_called_once_with('calendar', 'v3')
@@ -7,6 +7,7 @@ import datetime
 from unittest.mock import patch, MagicMock
 
 import pytz
+from django.core.cache import cache
 from django.test import TestCase, override_settings
 
 from apps.calendar_bot.models import CalendarToken
@@ -43,6 +44,7 @@ class SendChangeAlertsTests(TestCase):
     PHONE = '+1234567890'
 
     def setUp(self):
+        cache.clear()
         _make_token(phone=self.PHONE)
 
     def _today_dt(self, hour=10):
@@ -211,3 +213,125 @@ class SendChangeAlertsTests(TestCase):
         }]
         # Should not raise
         send_change_alerts(self.PHONE, changes)
+
+    @patch(PATCH_GET_USER_TZ)
+    @patch(PATCH_TWILIO)
+    def test_same_change_reported_twice_alerts_once(self, mock_twilio_cls, mock_get_tz):
+        from apps.calendar_bot.sync import send_change_alerts
+
+        mock_get_tz.return_value = pytz.UTC
+        mock_client = MagicMock()
+        mock_twilio_cls.return_value = mock_client
+
+        changes = [{
+            'type': 'new',
+            'event_id': 'evt_dup',
+            'title': 'Planning',
+            'old_start': None,
+            'new_start': self._tomorrow_dt(10),
+        }]
+        send_change_alerts(self.PHONE, changes)
+        send_change_alerts(self.PHONE, changes)
+
+        self.assertEqual(mock_client.messages.create.call_count, 1)
+
+        # The same event moving again is a new change and is alerted
+        send_change_alerts(self.PHONE, [{
+            'type': 'rescheduled',
+            'event_id': 'evt_dup',
+            'title': 'Planning',
+            'old_start': self._tomorrow_dt(10),
+            'new_start': self._tomorrow_dt(12),
+        }])
+        self.assertEqual(mock_client.messages.create.call_count, 2)
+
+    @patch(PATCH_GET_USER_TZ)
+    @patch(PATCH_TWILIO)
+    def test_changes_in_one_sync_share_one_message(self, mock_twilio_cls, mock_get_tz):
+        from apps.calendar_bot.sync import send_change_alerts
+
+        mock_get_tz.return_value = pytz.UTC
+        mock_client = MagicMock()
+        mock_twilio_cls.return_value = mock_client
+
+        changes = [
+            {
+                'type': 'new',
+                'event_id': 'evt_a',
+                'title': 'Design review',
+                'old_start': None,
+                'new_start': self._tomorrow_dt(9),
+            },
+            {
+                'type': 'cancelled',
+                'event_id': 'evt_b',
+                'title': 'Retro',
+                'old_start': self._tomorrow_dt(15),
+                'new_start': None,
+            },
+        ]
+        send_change_alerts(self.PHONE, changes)
+
+        mock_client.messages.create.assert_called_once()
+        body = mock_client.messages.create.call_args.kwargs['body']
+        self.assertIn('Design review', body)
+        self.assertIn('Retro', body)
+
+    @patch(PATCH_GET_USER_TZ)
+    @patch(PATCH_TWILIO)
+    def test_long_alert_batches_are_split(self, mock_twilio_cls, mock_get_tz):
+        from apps.calendar_bot.sync import ALERT_MESSAGE_MAX_CHARS, send_change_alerts
+
+        mock_get_tz.return_value = pytz.UTC
+        mock_client = MagicMock()
+        mock_twilio_cls.return_value = mock_client
+
+        changes = [
+            {
+                'type': 'new',
+                'event_id': f'evt_{i}',
+                'title': f'Meeting {i} ' + 'x' * 50,
+                'old_start': None,
+                'new_start': self._tomorrow_dt(8) + datetime.timedelta(minutes=i),
+            }
+            for i in range(40)
+        ]
+        send_change_alerts(self.PHONE, changes)
+
+        bodies = [c.kwargs['body'] for c in mock_client.messages.create.call_args_list]
+        self.assertGreater(len(bodies), 1)
+        self.assertTrue(all(len(body) <= ALERT_MESSAGE_MAX_CHARS for body in bodies))
+        self.assertEqual(sum(body.count('Meeting ') for body in bodies), 40)
+
+
+@override_settings(**TWILIO_SETTINGS)
+class TwilioHttpClientReuseTests(TestCase):
+    """Alerts reuse one pooled Twilio HTTP client instead of opening a session per send."""
+
+    PHONE = '+1234567890'
+
+    @patch(PATCH_GET_USER_TZ)
+    @patch(PATCH_TWILIO)
+    def test_alert_clients_share_http_client(self, mock_twilio_cls, mock_get_tz):
+        from apps.calendar_bot.sync import send_change_alerts
+        from apps.calendar_bot.twilio_http import twilio_http_client
+
+        cache.clear()
+        _make_token(phone=self.PHONE)
+        mock_get_tz.return_value = pytz.UTC
+        now = datetime.datetime.now(tz=pytz.UTC)
+        changes = [{
+            'type': 'new',
+            'event_id': 'evt_1',
+            'title': 'Sync',
+            'old_start': None,
+            'new_start': now + datetime.timedelta(hours=1),
+        }]
+
+        send_change_alerts(self.PHONE, changes)
+        send_change_alerts(self.PHONE, [dict(changes[0], event_id='evt_2')])
+
+        http_clients = [c.kwargs['http_client'] for c in mock_twilio_cls.call_args_list]
+        self.assertEqual(len(http_clients), 2)
+        self.assertIs(http_clients[0], twilio_http_client())
+        self.assertIs(http_clients[1], twilio_http_client())
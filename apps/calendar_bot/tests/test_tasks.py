@@ -53,7 +53,6 @@ def _make_cal_event_dict(title, hour, minute=0):
         'start_str': f'{hour:02d}:{minute:02d}',
         'summary': title,
         'end': (dt + datetime.timedelta(hours=1)).isoformat(),
-        'raw': {},
     }
 
 
@@ -65,9 +64,13 @@ class MorningDigestTaskTests(TestCase):
     PHONE_B = '+2222222222'
 
     def _run_task(self):
-        """Invoke the Celery task synchronously."""
-        from apps.calendar_bot.tasks import send_morning_meetings_digest
-        send_morning_meetings_digest()
+        """Invoke the Celery task synchronously, running each queued per-phone digest inline."""
+        from apps.calendar_bot.tasks import send_morning_meetings_digest, send_phone_digest
+        with patch(
+            'apps.calendar_bot.tasks.send_phone_digest.delay',
+            side_effect=lambda phone_number: send_phone_digest(phone_number),
+        ):
+            send_morning_meetings_digest()
 
     @patch(PATCH_GET_USER_TZ)
     @patch(PATCH_GET_EVENTS)
@@ -221,6 +224,48 @@ class MorningDigestTaskTests(TestCase):
         # Should send exactly ONE message (not two)
         self.assertEqual(mock_client.messages.create.call_count, 1)
 
+    @patch(PATCH_GET_USER_TZ)
+    @patch(PATCH_GET_EVENTS)
+    @patch(PATCH_TWILIO)
+    def test_failed_send_retries(self, mock_twilio_cls, mock_get_events, mock_tz):
+        """A Twilio failure retries the phone's digest task instead of being dropped."""
+        from celery.exceptions import Retry
+        from apps.calendar_bot.tasks import send_phone_digest
+
+        _make_token(phone=self.PHONE_A, digest_hour=8, digest_minute=0)
+        mock_tz.return_value = pytz.UTC
+        mock_get_events.return_value = [_make_cal_event_dict('Standup', 9)]
+        mock_client = MagicMock()
+        mock_client.messages.create.side_effect = Exception('Twilio 503')
+        mock_twilio_cls.return_value = mock_client
+
+        with patch(
+            'apps.calendar_bot.tasks.send_phone_digest.retry', side_effect=Retry()
+        ) as mock_retry:
+            with self.assertRaises(Retry):
+                send_phone_digest(self.PHONE_A)
+
+        mock_retry.assert_called_once()
+        self.assertEqual(str(mock_retry.call_args.kwargs['exc']), 'Twilio 503')
+
+    @patch(PATCH_GET_USER_TZ)
+    @patch('apps.calendar_bot.tasks.send_phone_digest.delay')
+    def test_queues_one_digest_per_due_phone(self, mock_delay, mock_tz):
+        """Only phones whose digest time is now are queued, each on its own task."""
+        from apps.calendar_bot.tasks import send_morning_meetings_digest
+
+        _make_token(phone=self.PHONE_A, digest_hour=8, digest_minute=0, email='a@example.com')
+        _make_token(phone=self.PHONE_A, digest_hour=8, digest_minute=0, email='a2@example.com')
+        _make_token(phone=self.PHONE_B, digest_hour=9, digest_minute=0, email='b@example.com')
+        mock_tz.return_value = pytz.UTC
+
+        with patch('apps.calendar_bot.tasks.datetime') as mock_dt:
+            mock_dt.datetime.now.return_value = datetime.datetime(2026, 2, 21, 8, 0, tzinfo=pytz.UTC)
+            mock_dt.timezone = datetime.timezone
+            send_morning_meetings_digest()
+
+        mock_delay.assert_called_once_with(self.PHONE_A)
+
 
 @override_settings(**TWILIO_SETTINGS)
 class RenewWatchChannelsTests(TestCase):
@@ -236,6 +281,15 @@ class RenewWatchChannelsTests(TestCase):
             refresh_token='b',
         )
 
+    def _run_task(self, renew_watch_channels):
+        """Run the task, executing each queued per-token renewal inline."""
+        from apps.calendar_bot.tasks import renew_token_watch_channel
+        with patch(
+            'apps.calendar_bot.tasks.renew_token_watch_channel.delay',
+            side_effect=lambda token_pk: renew_token_watch_channel(token_pk),
+        ):
+            renew_watch_channels()
+
     @patch('apps.calendar_bot.tasks.register_watch_channel')
     def test_renews_expiring_channels_with_token(self, mock_register):
         """Channels with a token FK that are expiring should be renewed."""
@@ -249,10 +303,27 @@ class RenewWatchChannelsTests(TestCase):
             expiry=now + datetime.timedelta(hours=12),
         )
 
-        renew_watch_channels()
+        self._run_task(renew_watch_channels)
 
         mock_register.assert_called_once_with(self.token)
 
+    @patch('apps.calendar_bot.tasks.renew_token_watch_channel.delay')
+    def test_queues_each_token_once(self, mock_delay):
+        """A token with several expiring channels is renewed by a single task."""
+        from apps.calendar_bot.tasks import renew_watch_channels
+
+        now = datetime.datetime.now(tz=pytz.UTC)
+        for hours in (6, 12):
+            CalendarWatchChannel.objects.create(
+                phone_number=self.PHONE,
+                token=self.token,
+                expiry=now + datetime.timedelta(hours=hours),
+            )
+
+        renew_watch_channels()
+
+        mock_delay.assert_called_once_with(self.token.pk)
+
     @patch('apps.calendar_bot.tasks.register_watch_channel')
     def test_skips_channels_without_token_fk(self, mock_register):
         """Channels without a token FK (legacy) should be skipped."""
@@ -266,7 +337,7 @@ class RenewWatchChannelsTests(TestCase):
             expiry=now + datetime.timedelta(hours=12),
         )
 
-        renew_watch_channels()
+        self._run_task(renew_watch_channels)
 
         mock_register.assert_not_called()
 
@@ -282,7 +353,7 @@ class RenewWatchChannelsTests(TestCase):
             expiry=now + datetime.timedelta(hours=48),
         )
 
-        renew_watch_channels()
+        self._run_task(renew_watch_channels)
 
         mock_register.assert_not_called()
 
@@ -290,5 +361,209 @@ class RenewWatchChannelsTests(TestCase):
     def test_no_channels_does_not_crash(self, mock_register):
         from apps.calendar_bot.tasks import renew_watch_channels
 
-        renew_watch_channels()
+        self._run_task(renew_watch_channels)
         mock_register.assert_not_called()
+
+
+@override_settings(**TWILIO_SETTINGS)
+class RefreshExpiringTokensTests(TestCase):
+    """Tests for refresh_expiring_tokens task."""
+
+    PHONE = '+4444444444'
+
+    def _make_token(self, email, expires_in, refresh_token='refresh', phone=PHONE, digest_in=5):
+        now = datetime.datetime.now(tz=pytz.UTC)
+        digest_at = now + datetime.timedelta(minutes=digest_in)
+        return CalendarToken.objects.create(
+            phone_number=phone,
+            account_email=email,
+            access_token='a',
+            refresh_token=refresh_token,
+            token_expiry=now + expires_in,
+            digest_hour=digest_at.hour,
+            digest_minute=digest_at.minute,
+        )
+
+    @patch('apps.calendar_bot.tasks.refresh_tokens', return_value=[])
+    def test_refreshes_only_tokens_expiring_soon(self, mock_refresh):
+        from apps.calendar_bot.tasks import refresh_expiring_tokens
+
+        soon = self._make_token('soon@example.com', datetime.timedelta(minutes=3))
+        self._make_token('later@example.com', datetime.timedelta(minutes=50))
+        self._make_token('dead@example.com', -datetime.timedelta(days=3))
+        self._make_token('norefresh@example.com', datetime.timedelta(minutes=3), refresh_token='')
+
+        refresh_expiring_tokens()
+
+        mock_refresh.assert_called_once_with([soon])
+
+    @patch('apps.calendar_bot.tasks.refresh_tokens', return_value=[])
+    def test_skips_phones_without_an_upcoming_digest(self, mock_refresh):
+        """Idle accounts are left to the on-demand refresh in get_calendar_service."""
+        from apps.calendar_bot.tasks import refresh_expiring_tokens
+
+        due = self._make_token('due@example.com', datetime.timedelta(minutes=3))
+        self._make_token(
+            'idle@example.com', datetime.timedelta(minutes=3), phone='+4444444445', digest_in=120,
+        )
+
+        refresh_expiring_tokens()
+
+        mock_refresh.assert_called_once_with([due])
+
+    @patch('apps.calendar_bot.calendar_service._refresh_credentials')
+    def test_failure_does_not_stop_other_tokens(self, mock_refresh):
+        from django.core.cache import cache
+        from apps.calendar_bot.tasks import refresh_expiring_tokens
+
+        bad = self._make_token('bad@example.com', datetime.timedelta(minutes=2))
+        good = self._make_token('good@example.com', datetime.timedelta(minutes=4))
+        new_expiry = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+
+        def fake_refresh(token):
+            if token.account_email == 'bad@example.com':
+                raise Exception('invalid_grant')
+            return MagicMock(token='fresh', expiry=new_expiry)
+
+        mock_refresh.side_effect = fake_refresh
+
+        cache.clear()
+        # Two extra queries find the primary token and timezone for the digest check
+        with self.assertNumQueries(4):
+            refresh_expiring_tokens()
+
+        self.assertEqual(mock_refresh.call_count, 2)
+        bad.refresh_from_db()
+        good.refresh_from_db()
+        self.assertEqual(bad.access_token, 'a')
+        self.assertEqual(good.access_token, 'fresh')
+
+
+class RefreshCalendarTokenTests(TestCase):
+    """Tests for refresh_calendar_token task."""
+
+    @patch('apps.calendar_bot.tasks.refresh_access_token')
+    def test_refreshes_token(self, mock_refresh):
+        from apps.calendar_bot.tasks import refresh_calendar_token
+
+        token = CalendarToken.objects.create(
+            phone_number='+4444444445',
+            account_email='one@example.com',
+            access_token='a',
+            refresh_token='refresh',
+        )
+        refresh_calendar_token(token.pk)
+
+        mock_refresh.assert_called_once_with(token)
+
+    @patch('apps.calendar_bot.tasks.refresh_access_token')
+    def test_deleted_token_ignored(self, mock_refresh):
+        from apps.calendar_bot.tasks import refresh_calendar_token
+
+        refresh_calendar_token(999999)
+
+        mock_refresh.assert_not_called()
+
+
+class SyncTokenChangesTests(TestCase):
+    """Tests for sync_token_changes task."""
+
+    PHONE = '+4444444446'
+
+    @patch('apps.calendar_bot.tasks.send_change_alerts')
+    @patch('apps.calendar_bot.tasks.sync_calendar_snapshot')
+    def test_syncs_token_and_sends_alerts(self, mock_sync, mock_alerts):
+        from apps.calendar_bot.tasks import sync_token_changes
+
+        token = CalendarToken.objects.create(
+            phone_number=self.PHONE,
+            access_token='a',
+            refresh_token='refresh',
+        )
+        changes = [{'type': 'new', 'event_id': 'e1', 'title': 'Meeting',
+                    'old_start': None, 'new_start': None}]
+        mock_sync.return_value = changes
+
+        sync_token_changes(token.pk)
+
+        mock_sync.assert_called_once_with(token)
+        mock_alerts.assert_called_once_with(self.PHONE, changes)
+
+    @patch('apps.calendar_bot.tasks.send_change_alerts')
+    @patch('apps.calendar_bot.tasks.sync_calendar_snapshot', side_effect=Exception('boom'))
+    def test_sync_failure_sends_no_alerts(self, mock_sync, mock_alerts):
+        from apps.calendar_bot.tasks import sync_token_changes
+
+        token = CalendarToken.objects.create(
+            phone_number=self.PHONE,
+            access_token='a',
+            refresh_token='refresh',
+        )
+        sync_token_changes(token.pk)
+
+        mock_alerts.assert_not_called()
+
+    @patch('apps.calendar_bot.tasks.send_change_alerts')
+    @patch('apps.calendar_bot.tasks.sync_calendar_snapshot', return_value=[])
+    def test_running_sync_lets_the_next_push_queue_again(self, mock_sync, mock_alerts):
+        from django.core.cache import cache
+        from apps.calendar_bot.tasks import queue_token_sync, sync_token_changes
+
+        cache.clear()
+        token = CalendarToken.objects.create(
+            phone_number=self.PHONE,
+            access_token='a',
+            refresh_token='refresh',
+        )
+        with patch('apps.calendar_bot.tasks.sync_token_changes.apply_async') as mock_apply_async:
+            self.assertTrue(queue_token_sync(token.pk))
+            self.assertFalse(queue_token_sync(token.pk))
+            sync_token_changes(token.pk)
+            self.assertTrue(queue_token_sync(token.pk))
+
+        self.assertEqual(mock_apply_async.call_count, 2)
+
+
+class KeepRefreshTokensAliveTests(TestCase):
+    """Tests for keep_refresh_tokens_alive task."""
+
+    PHONE = '+4444444447'
+
+    def _make_token(self, email, expiry, refresh_token='refresh'):
+        return CalendarToken.objects.create(
+            phone_number=self.PHONE,
+            account_email=email,
+            access_token='a',
+            refresh_token=refresh_token,
+            token_expiry=expiry,
+        )
+
+    @patch('apps.calendar_bot.tasks.time.sleep')
+    @patch('apps.calendar_bot.tasks.refresh_tokens', side_effect=lambda tokens: tokens)
+    def test_refreshes_only_idle_tokens(self, mock_refresh, mock_sleep):
+        from apps.calendar_bot.tasks import keep_refresh_tokens_alive
+
+        now = datetime.datetime.now(tz=pytz.UTC)
+        idle = self._make_token('idle@example.com', now - datetime.timedelta(days=200))
+        unknown = self._make_token('unknown@example.com', None)
+        self._make_token('active@example.com', now - datetime.timedelta(days=2))
+        self._make_token('norefresh@example.com', None, refresh_token='')
+
+        keep_refresh_tokens_alive()
+
+        mock_refresh.assert_called_once_with([idle, unknown])
+        mock_sleep.assert_not_called()
+
+    @patch('apps.calendar_bot.tasks.KEEPALIVE_BATCH_SIZE', 2)
+    @patch('apps.calendar_bot.tasks.time.sleep')
+    @patch('apps.calendar_bot.tasks.refresh_tokens', side_effect=lambda tokens: tokens)
+    def test_refreshes_in_rate_limited_batches(self, mock_refresh, mock_sleep):
+        from apps.calendar_bot.tasks import keep_refresh_tokens_alive
+
+        for i in range(5):
+            self._make_token(f'idle{i}@example.com', None)
+
+        keep_refresh_tokens_alive()
+
+        self.assertEqual([len(c.args[0]) for c in mock_refresh.call_args_list], [2, 2, 1])
+        self.assertEqual(mock_sleep.call_count, 2)
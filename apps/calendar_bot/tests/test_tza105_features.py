@@ -292,6 +292,35 @@ class RenewWatchChannelsCommandTests(TestCase):
         call_command('renew_watch_channels', phone='+11111111', stdout=out, stderr=err)
         mock_register.assert_called_once_with(token_a)
 
+    @override_settings(WEBHOOK_BASE_URL='https://example.com')
+    @patch('apps.calendar_bot.management.commands.renew_watch_channels.register_watch_channel')
+    def test_command_renews_tokens_concurrently_and_counts_each(self, mock_register):
+        """With several workers every token is renewed and failures are still counted."""
+        ok = MagicMock(channel_id='c1', expiry=datetime.datetime(2026, 4, 1, tzinfo=pytz.UTC))
+
+        def register(token):
+            if token.phone_number == '+33333333':
+                raise Exception('boom')
+            return ok
+
+        mock_register.side_effect = register
+        tokens = [
+            self._make_token(phone='+11111111'),
+            self._make_token(phone='+22222222', email='b@example.com'),
+            self._make_token(phone='+33333333', email='c@example.com'),
+        ]
+        out = StringIO()
+        err = StringIO()
+        call_command('renew_watch_channels', workers=4, stdout=out, stderr=err)
+
+        self.assertEqual(
+            sorted(c.args[0].pk for c in mock_register.call_args_list),
+            sorted(t.pk for t in tokens),
+        )
+        self.assertIn('success=2', out.getvalue())
+        self.assertIn('errors=1', out.getvalue())
+        self.assertIn('+33333333', err.getvalue())
+
     @override_settings(WEBHOOK_BASE_URL='https://example.com')
     def test_command_no_tokens_exits_cleanly(self):
         """When no tokens exist the command must exit without error."""
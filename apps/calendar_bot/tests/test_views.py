@@ -6,6 +6,7 @@ All Google OAuth and Twilio calls are mocked.
 """
 from unittest.mock import patch, MagicMock, call
 
+from django.core.cache import cache
 from django.test import TestCase, RequestFactory, Client, override_settings
 
 from apps.calendar_bot.models import CalendarToken, CalendarWatchChannel
@@ -244,6 +245,7 @@ class CalendarNotificationsTests(TestCase):
     PHONE = '+1234567890'
 
     def setUp(self):
+        cache.clear()
         self.client = Client()
         CalendarToken.objects.create(
             phone_number=self.PHONE,
@@ -266,16 +268,13 @@ class CalendarNotificationsTests(TestCase):
         )
         self.assertEqual(response.status_code, 404)
 
-    @patch('apps.calendar_bot.sync.send_change_alerts')
-    @patch('apps.calendar_bot.calendar_service.sync_calendar_snapshot')
-    def test_calls_sync_for_known_channel(self, mock_sync, mock_alerts):
+    @patch('apps.calendar_bot.tasks.sync_token_changes.apply_async')
+    def test_queues_sync_for_known_channel(self, mock_apply_async):
         token = CalendarToken.objects.get(phone_number=self.PHONE)
         channel = CalendarWatchChannel.objects.create(
             phone_number=self.PHONE,
             token=token,
         )
-        mock_sync.return_value = []
-        mock_alerts.return_value = None
 
         response = self.client.post(
             '/calendar/notifications/',
@@ -284,28 +283,41 @@ class CalendarNotificationsTests(TestCase):
         )
 
         self.assertEqual(response.status_code, 200)
-        mock_sync.assert_called_once_with(token)
+        mock_apply_async.assert_called_once()
+        self.assertEqual(mock_apply_async.call_args.args[0], (token.pk,))
 
-    @patch('apps.calendar_bot.sync.send_change_alerts')
-    @patch('apps.calendar_bot.calendar_service.sync_calendar_snapshot')
-    def test_sends_change_alerts_after_sync(self, mock_sync, mock_alerts):
+    @patch('apps.calendar_bot.tasks.sync_token_changes.apply_async')
+    def test_burst_of_pushes_queues_one_sync(self, mock_apply_async):
         token = CalendarToken.objects.get(phone_number=self.PHONE)
         channel = CalendarWatchChannel.objects.create(
             phone_number=self.PHONE,
             token=token,
         )
-        changes = [{'type': 'new', 'event_id': 'e1', 'title': 'Meeting',
-                    'old_start': None, 'new_start': None}]
-        mock_sync.return_value = changes
-        mock_alerts.return_value = None
 
-        self.client.post(
+        for _ in range(3):
+            response = self.client.post(
+                '/calendar/notifications/',
+                content_type='application/json',
+                HTTP_X_GOOG_CHANNEL_ID=str(channel.channel_id),
+            )
+            self.assertEqual(response.status_code, 200)
+
+        mock_apply_async.assert_called_once()
+
+    @patch('apps.calendar_bot.tasks.sync_token_changes.apply_async')
+    def test_legacy_channel_without_token_queues_first_token(self, mock_apply_async):
+        token = CalendarToken.objects.get(phone_number=self.PHONE)
+        channel = CalendarWatchChannel.objects.create(phone_number=self.PHONE)
+
+        response = self.client.post(
             '/calendar/notifications/',
             content_type='application/json',
             HTTP_X_GOOG_CHANNEL_ID=str(channel.channel_id),
         )
 
-        mock_alerts.assert_called_once_with(self.PHONE, changes)
+        self.assertEqual(response.status_code, 200)
+        mock_apply_async.assert_called_once()
+        self.assertEqual(mock_apply_async.call_args.args[0], (token.pk,))
 
 
 @override_settings(
@@ -0,0 +1,33 @@
+"""
+Process-wide HTTP transport shared by every Twilio REST Client.
+
+A twilio.rest.Client builds its own requests.Session unless it is handed an
+http_client, so a client created per task or per request opened a fresh TLS
+connection to api.twilio.com for its first message. Passing
+twilio_http_client() keeps those connections alive across calls.
+"""
+import threading
+
+from requests.adapters import HTTPAdapter
+from twilio.http.http_client import TwilioHttpClient
+
+# Upper bound on pooled keep-alive connections to api.twilio.com per process;
+# sized for a threads-pool worker (see scripts/start.py).
+TWILIO_POOL_MAXSIZE = 20
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def twilio_http_client():
+    """Return the shared pooled TwilioHttpClient, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                http_client = TwilioHttpClient(pool_connections=True)
+                http_client.session.mount(
+                    'https://', HTTPAdapter(pool_maxsize=TWILIO_POOL_MAXSIZE),
+                )
+                _http_client = http_client
+    return _http_client
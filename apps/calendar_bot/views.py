@@ -1,6 +1,6 @@
+import datetime
 import logging
 
-import pytz
 from django.http import HttpResponse, HttpResponseRedirect
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
@@ -88,7 +88,7 @@ class CalendarAuthCallbackView(View):
 
         token_expiry = None
         if creds.expiry:
-            token_expiry = creds.expiry.replace(tzinfo=pytz.UTC)
+            token_expiry = creds.expiry.replace(tzinfo=datetime.timezone.utc)
 
         # Fetch Google email to use as account_email
         email = ''
@@ -120,7 +120,9 @@ class CalendarAuthCallbackView(View):
             try:
                 from .calendar_service import get_calendar_service
                 cal_service = get_calendar_service(token_obj)
-                primary_cal = cal_service.calendars().get(calendarId='primary').execute()
+                primary_cal = cal_service.calendars().get(
+                    calendarId='primary', fields='timeZone',
+                ).execute()
                 google_tz = primary_cal.get('timeZone', '')
                 if google_tz:
                     token_obj.timezone = google_tz
@@ -187,7 +189,12 @@ class CalendarAuthCallbackView(View):
         try:
             from twilio.rest import Client
             from django.conf import settings as django_settings
-            client = Client(django_settings.TWILIO_ACCOUNT_SID, django_settings.TWILIO_AUTH_TOKEN)
+            from .twilio_http import twilio_http_client
+            client = Client(
+                django_settings.TWILIO_ACCOUNT_SID,
+                django_settings.TWILIO_AUTH_TOKEN,
+                http_client=twilio_http_client(),
+            )
             client.messages.create(
                 from_=f'whatsapp:{django_settings.TWILIO_WHATSAPP_NUMBER}',
                 to=f'whatsapp:{phone}',
@@ -222,7 +229,7 @@ class CalendarNotificationsView(View):
         logger.info('[CalendarNotif] Google push received — channel_id: %s', channel_id_header)
 
         try:
-            watch_channel = CalendarWatchChannel.objects.select_related('token').get(
+            watch_channel = CalendarWatchChannel.objects.only('phone_number', 'token').get(
                 channel_id=channel_id_header
             )
         except CalendarWatchChannel.DoesNotExist:
@@ -234,41 +241,29 @@ class CalendarNotificationsView(View):
         logger.info('[CalendarNotif] Resolved phone: %s', phone_number)
 
         # Use the watch channel's token for scoped sync; fallback if token is NULL
-        token = watch_channel.token
-
-        # Sync calendar and detect changes
-        try:
-            from .calendar_service import sync_calendar_snapshot
-            if token is not None:
-                changes = sync_calendar_snapshot(token)
-            else:
-                # Legacy path: token is NULL, fall back to first token for phone
-                from .models import CalendarToken as CT
-                fallback_token = CT.objects.filter(
-                    phone_number=phone_number
-                ).order_by('created_at').first()
-                if fallback_token is None:
-                    logger.warning(
-                        'No token found for phone=%s in CalendarNotificationsView fallback',
-                        phone_number,
-                    )
-                    return HttpResponse('OK', status=200)
-                changes = sync_calendar_snapshot(fallback_token)
-        except Exception as exc:
-            logger.exception('Error syncing calendar snapshot for %s: %s', phone_number, exc)
-            return HttpResponse('OK', status=200)
-
-        logger.info('[CalendarNotif] sync returned %d change(s) for %s', len(changes), phone_number)
-
-        if not changes:
-            logger.info('[CalendarNotif] No changes — skipping alerts')
+        token_pk = watch_channel.token_id
+
+        if token_pk is None:
+            # Legacy path: token is NULL, fall back to first token for phone
+            token_pk = CalendarToken.objects.filter(
+                phone_number=phone_number
+            ).order_by('created_at').values_list('pk', flat=True).first()
+            if token_pk is None:
+                logger.warning(
+                    'No token found for phone=%s in CalendarNotificationsView fallback',
+                    phone_number,
+                )
+                return HttpResponse('OK', status=200)
 
-        # Send change alerts
+        # Sync and alert on a worker so Google gets its 200 right away;
+        # a slow or failed acknowledgement makes it retry the push. Bursts
+        # of pushes for the same token share one sync.
         try:
-            from .sync import send_change_alerts
-            send_change_alerts(phone_number, changes)
+            from .tasks import queue_token_sync
+            if not queue_token_sync(token_pk):
+                logger.info('[CalendarNotif] sync already queued for token pk=%s', token_pk)
         except Exception as exc:
-            logger.exception('Error sending change alerts for %s: %s', phone_number, exc)
+            logger.exception('Error queueing calendar sync for %s: %s', phone_number, exc)
 
         return HttpResponse('OK', status=200)
 
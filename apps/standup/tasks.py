@@ -3,6 +3,7 @@ from celery import shared_task
 from django.conf import settings
 from django.utils import timezone
 from twilio.rest import Client
+from apps.calendar_bot.twilio_http import twilio_http_client
 from apps.standup.models import StandupEntry
 
 logger = logging.getLogger(__name__)
@@ -42,6 +43,7 @@ def send_evening_digest(self):
     client = Client(
         settings.TWILIO_ACCOUNT_SID,
         settings.TWILIO_AUTH_TOKEN,
+        http_client=twilio_http_client(),
     )
     from_number = settings.TWILIO_WHATSAPP_NUMBER
     status_callback_url = f"{settings.WEBHOOK_BASE_URL}/standup/twilio-status/"
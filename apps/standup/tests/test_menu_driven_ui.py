@@ -472,6 +472,20 @@ class MenuDrivenUITests(TestCase):
         self.token.refresh_from_db()
         self.assertEqual(self.token.timezone, 'Asia/Jerusalem')
 
+    def test_settings_timezone_selection_refreshes_cached_tz(self):
+        """Changing the timezone must not leave a stale cached value behind."""
+        from apps.calendar_bot.calendar_service import get_user_tz
+
+        self.assertEqual(str(get_user_tz(PHONE)), 'Asia/Jerusalem')
+        UserMenuState.objects.create(
+            phone_number=PHONE,
+            pending_action='timezone_menu',
+            pending_step=1,
+            pending_data={},
+        )
+        self._post('2')
+        self.assertEqual(str(get_user_tz(PHONE)), 'Europe/London')
+
     def test_settings_timezone_invalid_option(self):
         """Settings > Timezone: invalid digit -> INVALID_OPTION + re-show menu."""
         UserMenuState.objects.create(
@@ -9,6 +9,7 @@ import datetime
 from unittest.mock import patch, MagicMock
 
 import pytz
+from django.core.cache import cache
 from django.test import TestCase
 
 
@@ -95,6 +96,9 @@ class WeekStartSundayBirthdayServiceTests(TestCase):
     is correct, verified against the same helper.
     """
 
+    def setUp(self):
+        cache.clear()
+
     def test_birthday_week_starts_on_sunday_from_wednesday(self):
         wednesday = datetime.date(2026, 2, 25)
         self.assertEqual(_week_start_sunday(wednesday), datetime.date(2026, 2, 22))
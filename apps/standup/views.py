@@ -158,8 +158,9 @@ def _main_menu_text(phone_number):
     """Return main menu text with optional personalized greeting."""
     import apps.standup.strings_he as s
     from apps.calendar_bot.models import CalendarToken
-    token = CalendarToken.objects.filter(phone_number=phone_number).order_by('created_at').first()
-    name = token.name if (token and token.name) else ''
+    name = CalendarToken.objects.filter(
+        phone_number=phone_number
+    ).order_by('created_at').values_list('name', flat=True).first() or ''
     if name:
         greeting = f'\u05d4\u05d9\u05d9 {name}! \u05d0\u05d9\u05d6\u05d4 \u05db\u05d9\u05e3 \u05e9\u05d0\u05ea\u05d4 \u05e4\u05d4 \U0001f389\n\n'
     else:
@@ -171,8 +172,10 @@ def _settings_menu_text(phone_number):
     """Return settings menu text with dynamic name item."""
     import apps.standup.strings_he as s
     from apps.calendar_bot.models import CalendarToken
-    token = CalendarToken.objects.filter(phone_number=phone_number).order_by('created_at').first()
-    name_item = s.NAME_MENU_ITEM_CHANGE if (token and token.name) else s.NAME_MENU_ITEM_NEW
+    name = CalendarToken.objects.filter(
+        phone_number=phone_number
+    ).order_by('created_at').values_list('name', flat=True).first()
+    name_item = s.NAME_MENU_ITEM_CHANGE if name else s.NAME_MENU_ITEM_NEW
     return (
         "\u2699\ufe0f \u05d4\u05d2\u05d3\u05e8\u05d5\u05ea:\n"
         "1. \U0001f30d \u05d0\u05d6\u05d5\u05e8 \u05d6\u05de\u05df\n"
@@ -255,10 +258,10 @@ class WhatsAppWebhookView(APIView):
             pass
 
         # Check calendar connection
-        token = CalendarToken.objects.filter(
+        access_token = CalendarToken.objects.filter(
             phone_number=from_number
-        ).order_by('created_at').first()
-        has_calendar = bool(token and token.access_token)
+        ).order_by('created_at').values_list('access_token', flat=True).first()
+        has_calendar = bool(access_token)
 
         if not has_calendar:
             if not OnboardingState.objects.filter(phone_number=from_number).exists():
@@ -588,10 +591,10 @@ class WhatsAppWebhookView(APIView):
         from apps.calendar_bot.calendar_service import get_user_tz, get_events_for_date
         from apps.calendar_bot.query_helpers import resolve_day, format_events_for_day, format_week_view
 
-        token = CalendarToken.objects.filter(
+        access_token = CalendarToken.objects.filter(
             phone_number=from_number
-        ).order_by('created_at').first()
-        if token is None or not token.access_token:
+        ).order_by('created_at').values_list('access_token', flat=True).first()
+        if not access_token:
             return s.NO_CALENDAR_CONNECTED
 
         user_tz = get_user_tz(from_number)
@@ -627,10 +630,10 @@ class WhatsAppWebhookView(APIView):
         from apps.calendar_bot.models import CalendarToken
         from apps.calendar_bot.calendar_service import get_user_tz, get_events_for_date
 
-        token = CalendarToken.objects.filter(
+        access_token = CalendarToken.objects.filter(
             phone_number=from_number
-        ).order_by('created_at').first()
-        if token is None or not token.access_token:
+        ).order_by('created_at').values_list('access_token', flat=True).first()
+        if not access_token:
             return s.NO_CALENDAR_CONNECTED
 
         user_tz = get_user_tz(from_number)
@@ -682,10 +685,10 @@ class WhatsAppWebhookView(APIView):
         from apps.calendar_bot.calendar_service import get_user_tz, get_free_slots_for_date
         from apps.calendar_bot.query_helpers import resolve_day
 
-        token = CalendarToken.objects.filter(
+        access_token = CalendarToken.objects.filter(
             phone_number=from_number
-        ).order_by('created_at').first()
-        if token is None or not token.access_token:
+        ).order_by('created_at').values_list('access_token', flat=True).first()
+        if not access_token:
             return s.NO_CALENDAR_CONNECTED
 
         user_tz = get_user_tz(from_number)
@@ -735,10 +738,10 @@ class WhatsAppWebhookView(APIView):
         from apps.calendar_bot.models import CalendarToken
         from apps.calendar_bot.calendar_service import get_birthdays_next_week, get_user_tz
 
-        token = CalendarToken.objects.filter(
+        access_token = CalendarToken.objects.filter(
             phone_number=from_number
-        ).order_by('created_at').first()
-        if token is None or not token.access_token:
+        ).order_by('created_at').values_list('access_token', flat=True).first()
+        if not access_token:
             return s.NO_CALENDAR_CONNECTED
 
         user_tz = get_user_tz(from_number)
@@ -799,9 +802,11 @@ class WhatsAppWebhookView(APIView):
 
     def _set_timezone(self, from_number, tz_name):
         import apps.standup.strings_he as s
+        from apps.calendar_bot.calendar_service import invalidate_user_tz
         from apps.calendar_bot.models import CalendarToken
 
         CalendarToken.objects.filter(phone_number=from_number).update(timezone=tz_name)
+        invalidate_user_tz(from_number)
         logger.info('Timezone set to %s for phone=%s', tz_name, from_number)
         return _xml(s.TIMEZONE_SET.format(tz_name=tz_name))
 
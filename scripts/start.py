@@ -2,7 +2,9 @@
 """Railway deployment entry point.
 
 Routes to the correct process based on SERVICE_TYPE environment variable:
-  - "worker"  -> Celery worker (+ minimal health server on $PORT)
+  - "worker"  -> Celery worker (+ minimal health server on $PORT); the queues,
+                 pool and concurrency come from CELERY_WORKER_QUEUES,
+                 CELERY_WORKER_POOL and CELERY_WORKER_CONCURRENCY
   - "beat"    -> Celery beat scheduler (+ minimal health server on $PORT)
   - (default) -> Django migrate + Gunicorn web server
 """
@@ -39,8 +41,19 @@ def main():
     if service_type == "worker":
         print("Starting Celery worker...", flush=True)
         _start_health_server(port)
+        # Defaults serve every queue from one prefork worker. An I/O-only worker
+        # can be run alongside, e.g. CELERY_WORKER_QUEUES=calendar_io
+        # CELERY_WORKER_POOL=threads CELERY_WORKER_CONCURRENCY=20.
+        queues = os.environ.get("CELERY_WORKER_QUEUES", "celery,calendar_io")
+        pool = os.environ.get("CELERY_WORKER_POOL", "prefork")
+        concurrency = os.environ.get("CELERY_WORKER_CONCURRENCY", "2")
         result = subprocess.run(
-            ["celery", "-A", "standup_bot", "worker", "--loglevel=info", "--concurrency=2"]
+            [
+                "celery", "-A", "standup_bot", "worker", "--loglevel=info",
+                "--queues", queues,
+                "--pool", pool,
+                "--concurrency", concurrency,
+            ]
         )
         sys.exit(result.returncode)
 
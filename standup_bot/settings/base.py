@@ -76,6 +76,17 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 
+# Short, latency-sensitive tasks that mostly wait on Google/Twilio go to their
+# own queue, so the nightly batch jobs on the default queue cannot hold them up.
+# Workers consume both queues unless CELERY_WORKER_QUEUES says otherwise
+# (see scripts/start.py).
+CELERY_IO_QUEUE = 'calendar_io'
+CELERY_TASK_ROUTES = {
+    'apps.calendar_bot.tasks.sync_token_changes': {'queue': CELERY_IO_QUEUE},
+    'apps.calendar_bot.tasks.send_phone_digest': {'queue': CELERY_IO_QUEUE},
+    'apps.calendar_bot.tasks.refresh_calendar_token': {'queue': CELERY_IO_QUEUE},
+}
+
 # Morning digest default time (UTC)
 MORNING_DIGEST_HOUR = config('MORNING_DIGEST_HOUR', default=8, cast=int)
 MORNING_DIGEST_MINUTE = config('MORNING_DIGEST_MINUTE', default=30, cast=int)
@@ -91,6 +102,14 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'apps.calendar_bot.tasks.renew_watch_channels',
         'schedule': crontab(hour='3', minute='0'),  # 3am UTC daily
     },
+    'refresh-expiring-tokens': {
+        'task': 'apps.calendar_bot.tasks.refresh_expiring_tokens',
+        'schedule': crontab(minute='*/5'),
+    },
+    'keep-refresh-tokens-alive': {
+        'task': 'apps.calendar_bot.tasks.keep_refresh_tokens_alive',
+        'schedule': crontab(day_of_month='1', hour='4', minute='0'),  # 4am UTC monthly
+    },
 }
 
 LOGGING = {
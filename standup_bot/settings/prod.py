@@ -14,6 +14,16 @@ DATABASES = {
 
 CELERY_BROKER_URL = config('REDIS_URL', default='redis://localhost:6379/0')
 
+# Shared cache so the web and worker processes see the same cached values
+# (and the same invalidations).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('REDIS_URL', default='redis://localhost:6379/0'),
+        'KEY_PREFIX': 'standup_bot',
+    }
+}
+
 # Railway handles SSL at the proxy level — do not redirect internally
 SECURE_SSL_REDIRECT = False
 SESSION_COOKIE_SECURE = True